@@ -10,7 +10,6 @@ Usage:
 """
 import sys
 import os
-from pathlib import Path
 
 HELP_TEXT = """
 CodeSensei v1.0 — AI-Powered Code Analysis
@@ -52,15 +51,18 @@ TIPS
 
 def _set_utf8():
     """Force UTF-8 output so the ASCII art banner renders correctly everywhere."""
+    # Windows: set PYTHONIOENCODING so subprocesses also use UTF-8
+    if os.name == "nt":
+        os.environ.setdefault("PYTHONIOENCODING", "utf-8")
     for stream in (sys.stdout, sys.stderr):
+        # Already UTF-8 (the norm on Linux/macOS) — skip the reconfigure/flush
+        if (getattr(stream, "encoding", None) or "").lower().replace("-", "") == "utf8":
+            continue
         try:
             if hasattr(stream, "reconfigure"):
                 stream.reconfigure(encoding="utf-8", errors="replace")
         except Exception:
             pass
-    # Windows: set PYTHONIOENCODING so subprocesses also use UTF-8
-    if os.name == "nt":
-        os.environ.setdefault("PYTHONIOENCODING", "utf-8")
 
 
 def main():
@@ -76,17 +78,18 @@ def main():
         print(HELP_TEXT)
         sys.exit(0)
 
-    # Resolve project path
+    # Resolve project path — plain os.path is enough for existence checks;
+    # the UI resolves symlinks itself when it builds the file tree
     raw = args[0] if args else "."
-    path = Path(raw).resolve()
+    path = os.path.abspath(raw)
 
-    if not path.exists():
+    if not os.path.exists(path):
         print(f"\nError: Path does not exist: {path}", file=sys.stderr)
         print("Usage: python app.py [project-path]\n", file=sys.stderr)
         sys.exit(1)
 
-    if not path.is_dir():
-        print(f"\nError: '{path.name}' is a file, not a folder.", file=sys.stderr)
+    if not os.path.isdir(path):
+        print(f"\nError: '{os.path.basename(path)}' is a file, not a folder.", file=sys.stderr)
         print("CodeSensei needs a project folder. Example: python app.py my_project/\n", file=sys.stderr)
         sys.exit(1)
 
@@ -96,7 +99,7 @@ def main():
         sys.exit(1)
 
     from codesensei.ui import run_app
-    run_app(str(path))
+    run_app(path)
 
 
 if __name__ == "__main__":
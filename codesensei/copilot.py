@@ -1,18 +1,53 @@
+import re
+import asyncio
 import subprocess
 import time
-import tempfile
 import os
 import pathlib
+import shutil
+import tempfile
+import functools
+import hashlib
+import json
+
+# gh checks GitHub for CLI and extension updates on every invocation; that is
+# pure startup overhead for one-shot prompts, so turn it off for our calls.
+_COPILOT_ENV = {
+    **os.environ,
+    'GH_NO_UPDATE_NOTIFIER': '1',
+    'GH_NO_EXTENSION_UPDATE_NOTIFIER': '1',
+    'GH_PROMPT_DISABLED': '1',
+}
+
+
+# Successful Copilot answers for unchanged source are reused from disk.
+# Entries are keyed by a hash of the full prompt, which embeds the file
+# content, so any edit to the file produces a new key. Entries expire after
+# _RESULT_CACHE_TTL seconds and only the newest _RESULT_CACHE_MAX_ENTRIES
+# are kept.
+_RESULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'codesensei', 'results')
+_RESULT_CACHE_TTL = 24 * 3600
+_RESULT_CACHE_MAX_ENTRIES = 256
+
 
+@functools.lru_cache(maxsize=1)
+def _gh_executable() -> str:
+    """Resolve the gh binary once per process instead of on every PATH lookup."""
+    return shutil.which('gh') or 'gh'
 
+
+@functools.lru_cache(maxsize=256)
 def _file_suffix(filename: str) -> str:
-    """Return the file extension to use for the temp file, defaulting to .txt."""
+    """Return the file extension used to label source in prompts, defaulting to .txt."""
     suffix = pathlib.Path(filename).suffix
     return suffix if suffix else '.txt'
 
 
+@functools.lru_cache(maxsize=1)
 def check_copilot_installed():
-    """Check if GitHub Copilot CLI is available"""
+    """Check if GitHub Copilot CLI is available (memoized for the process lifetime)"""
+    if shutil.which("gh") is None:
+        return False
     try:
         result = subprocess.run(
             ["gh", "copilot", "--version"],
@@ -27,13 +62,52 @@ def check_copilot_installed():
         return False
 
 
-def sanitize_code(content, max_lines=800):
+# Line-comment syntax by extension, used by sanitize_code() when trimming
+_HASH_COMMENT_EXTS = frozenset({
+    '.py', '.pyi', '.pyw', '.sh', '.bash', '.zsh', '.rb', '.yml', '.yaml', '.toml',
+    '.r', '.pl', '.ex', '.exs', '.tf', '.cfg', '.ini', '.conf', '.ps1', '.cmake',
+    '.nix', '.mk', '.dockerfile',
+})
+# Extension-less (or misleadingly suffixed) files matched by lower-cased name
+_HASH_COMMENT_NAMES = frozenset({
+    'dockerfile', 'containerfile', 'makefile', 'gnumakefile', 'cmakelists.txt',
+    'rakefile', 'gemfile', 'vagrantfile', 'procfile', '.gitignore', '.dockerignore',
+    '.gitattributes', '.editorconfig', '.env',
+})
+_SLASH_COMMENT_EXTS = frozenset({
+    '.js', '.jsx', '.ts', '.tsx', '.java', '.c', '.h', '.cpp', '.cc', '.cxx',
+    '.hpp', '.cs', '.go', '.rs', '.swift', '.kt', '.kts', '.scala', '.dart',
+    '.php', '.fs', '.fsx', '.proto', '.scss',
+})
+
+
+def _comment_prefix(filename):
+    """Return the line-comment marker for filename ('#', '//' or None if unknown).
+
+    With no filename the historical '#' behaviour is kept.
+    """
+    if filename is None:
+        return '#'
+    name = pathlib.PurePath(filename).name.lower()
+    if name in _HASH_COMMENT_NAMES or name.startswith('dockerfile.'):
+        return '#'
+    suffix = _file_suffix(filename).lower()
+    if suffix in _HASH_COMMENT_EXTS:
+        return '#'
+    if suffix in _SLASH_COMMENT_EXTS:
+        return '//'
+    return None
+
+
+def sanitize_code(content, max_lines=800, filename=None):
     """Clean up code before sending to AI to avoid token limits.
 
     Returns (code_str, meta) where meta = {was_truncated, original_lines, comments_removed}.
     Strategy:
       1. Collapse consecutive blank lines.
       2. If still over limit, strip standalone comment-only lines (keeps more real code).
+         The comment marker is picked from `filename`; languages without a
+         known line-comment syntax skip straight to step 3.
       3. Hard-truncate at max_lines if still needed.
     """
     if not content:
@@ -46,33 +120,40 @@ def sanitize_code(content, max_lines=800):
     cleaned = []
     prev_blank = False
     for line in lines:
-        is_blank = line.strip() == ''
+        is_blank = not line.strip()
         if is_blank and prev_blank:
             continue
         cleaned.append(line)
         prev_blank = is_blank
 
-    # Step 2: smart truncation — remove standalone comment lines to free space
     comments_removed = 0
-    if len(cleaned) > max_lines:
-        smart = []
-        for line in cleaned:
-            stripped = line.strip()
-            # Remove pure comment lines; keep shebangs (#!) and keep inline comments
-            if stripped.startswith('#') and not stripped.startswith('#!'):
-                comments_removed += 1
-                continue
-            smart.append(line)
-        cleaned = smart
-
-    # Step 3: hard truncate if still over limit
     was_truncated = False
+
+    # Steps 2 + 3 in one pass: drop standalone comment lines (keep shebangs
+    # and inline comments) and hard-truncate as soon as max_lines is reached
     if len(cleaned) > max_lines:
-        cleaned = cleaned[:max_lines]
+        prefix = _comment_prefix(filename)
+        if prefix is None:
+            # No known comment syntax — nothing to strip, cut directly
+            cleaned = cleaned[:max_lines]
+            was_truncated = True
+        else:
+            kept = []
+            for line in cleaned:
+                stripped = line.lstrip()
+                if stripped.startswith(prefix) and not stripped.startswith('#!'):
+                    comments_removed += 1
+                    continue
+                if len(kept) == max_lines:
+                    was_truncated = True
+                    break
+                kept.append(line)
+            cleaned = kept
+
+    if was_truncated:
         cleaned.append(
             f"\n# ... (truncated at {max_lines} lines — original file: {original_line_count} lines)"
         )
-        was_truncated = True
 
     meta = {
         'was_truncated': was_truncated,
@@ -82,6 +163,22 @@ def sanitize_code(content, max_lines=800):
     return '\n'.join(cleaned), meta
 
 
+# Lines that open a tool block (●, •, ✗, ✓)
+_TOOL_START = re.compile(r'^\s*[●•✗✓]\s+\S')
+# Lines that are part of a tool block output (indented sub-lines)
+_TOOL_CONTENT = re.compile(
+    r'^\s+('
+    r'└'                   # result summary (└ N lines read)
+    r'|\$\s'               # shell command ($ pwsh ...)
+    r'|Permission'         # permission errors
+    r'|<exited'            # exit status blocks
+    r'|Error:'             # error messages
+    r'|FullName'           # PowerShell output headers
+    r'|IsReadOnly'
+    r')'
+)
+
+
 def _strip_tooluse(text: str) -> str:
     """Remove Copilot's internal tool-use step lines from a response.
 
@@ -94,22 +191,6 @@ def _strip_tooluse(text: str) -> str:
         Permission denied    — error output inside a tool block
         <exited with error>  — exit status inside a tool block
     """
-    import re
-    # Lines that open a tool block (●, •, ✗, ✓)
-    _TOOL_START = re.compile(r'^\s*[●•✗✓]\s+\S')
-    # Lines that are part of a tool block output (indented sub-lines)
-    _TOOL_CONTENT = re.compile(
-        r'^\s+('
-        r'└'                   # result summary (└ N lines read)
-        r'|\$\s'               # shell command ($ pwsh ...)
-        r'|Permission'         # permission errors
-        r'|<exited'            # exit status blocks
-        r'|Error:'             # error messages
-        r'|FullName'           # PowerShell output headers
-        r'|IsReadOnly'
-        r')'
-    )
-
     lines = text.splitlines()
     filtered = []
     in_tool_block = False
@@ -147,47 +228,60 @@ def _strip_tooluse(text: str) -> str:
     return '\n'.join(result).strip()
 
 
+# What result dicts report as 'command'. The real argv carries the whole
+# prompt, source included, which is neither displayable nor worth caching.
+_COMMAND_LABEL = 'gh copilot -p <prompt>'
+
+
+def _completed_result(returncode, stdout, stderr, elapsed) -> dict:
+    """Build the call_copilot() result dict for a process that ran to completion."""
+    if returncode == 0:
+        return {
+            'response': stdout.strip(),
+            'stats': stderr.strip(),
+            'command': _COMMAND_LABEL,
+            'elapsed_ms': round(elapsed * 1000, 2),
+            'success': True,
+            'error': None
+        }
+    return {
+        'response': '',
+        'stats': stderr.strip(),
+        'command': _COMMAND_LABEL,
+        'elapsed_ms': round(elapsed * 1000, 2),
+        'success': False,
+        'error': stderr.strip()
+    }
+
+
 def call_copilot(prompt, timeout=60):
-    """Call GitHub Copilot CLI. Returns structured dict with response, stats, timing."""
-    cmd = ["gh", "copilot", "-p", prompt]
+    """Call GitHub Copilot CLI. Returns structured dict with response, stats, timing.
+
+    `gh copilot -p` is one-shot (no request/response protocol over stdin), so
+    each call is its own process; the gh path is resolved once and gh's
+    update notifiers are disabled to keep that per-call startup minimal.
+    """
     flags = subprocess.CREATE_NO_WINDOW if os.name == "nt" else 0
 
     try:
         start = time.time()
         result = subprocess.run(
-            cmd,
+            [_gh_executable(), 'copilot', '-p', prompt],
             capture_output=True,
             text=True,
             encoding='utf-8',
             timeout=timeout,
-            creationflags=flags
+            creationflags=flags,
+            env=_COPILOT_ENV,
         )
         elapsed = time.time() - start
-
-        if result.returncode == 0:
-            return {
-                'response': result.stdout.strip(),
-                'stats': result.stderr.strip(),
-                'command': ' '.join(cmd),
-                'elapsed_ms': round(elapsed * 1000, 2),
-                'success': True,
-                'error': None
-            }
-        else:
-            return {
-                'response': '',
-                'stats': result.stderr.strip(),
-                'command': ' '.join(cmd),
-                'elapsed_ms': round(elapsed * 1000, 2),
-                'success': False,
-                'error': result.stderr.strip()
-            }
+        return _completed_result(result.returncode, result.stdout, result.stderr, elapsed)
 
     except subprocess.TimeoutExpired:
         return {
             'response': '',
             'stats': '',
-            'command': ' '.join(cmd),
+            'command': _COMMAND_LABEL,
             'elapsed_ms': timeout * 1000,
             'success': False,
             'error': f'timed out after {timeout}s'
@@ -196,48 +290,216 @@ def call_copilot(prompt, timeout=60):
         return {
             'response': '',
             'stats': '',
-            'command': ' '.join(cmd),
+            'command': _COMMAND_LABEL,
             'elapsed_ms': 0,
             'success': False,
             'error': f'Error calling Copilot: {str(e)}'
         }
 
 
-def summarize_file(file_content, filename):
-    """Mode A: Generates a high-level overview."""
-    clean_code, trunc_meta = sanitize_code(file_content)
+async def call_copilot_async(prompt, timeout=60):
+    """Async variant of call_copilot() — lets several Copilot calls overlap.
 
-    with tempfile.NamedTemporaryFile(mode='w', suffix=_file_suffix(filename), delete=False, encoding='utf-8') as f:
-        f.write(clean_code)
-        temp_path = f.name
+    Returns the same dict shape as call_copilot().
+    """
+    flags = subprocess.CREATE_NO_WINDOW if os.name == "nt" else 0
 
     try:
-        prompt = (
-            f"Read the file at '{temp_path}'. Act as a patient teacher explaining to a junior developer.\n"
-            "Cover:\n"
-            "1. WHAT IT DOES — plain language summary\n"
-            "2. KEY CONCEPTS — programming concepts used\n"
-            "3. BEST PRACTICES — good things this code demonstrates\n"
-            "4. LEARNING OPPORTUNITY — one thing to study further\n"
-            "Keep it clear, friendly, and beginner-accessible."
+        start = time.time()
+        proc = await asyncio.create_subprocess_exec(
+            _gh_executable(), 'copilot', '-p', prompt,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            creationflags=flags,
+            env=_COPILOT_ENV,
         )
-        result = call_copilot(prompt)
-        result['truncation'] = trunc_meta
-        return result
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            return {
+                'response': '',
+                'stats': '',
+                'command': _COMMAND_LABEL,
+                'elapsed_ms': timeout * 1000,
+                'success': False,
+                'error': f'timed out after {timeout}s'
+            }
+        elapsed = time.time() - start
+        return _completed_result(
+            proc.returncode,
+            stdout.decode('utf-8', errors='replace'),
+            stderr.decode('utf-8', errors='replace'),
+            elapsed,
+        )
+    except Exception as e:
+        return {
+            'response': '',
+            'stats': '',
+            'command': _COMMAND_LABEL,
+            'elapsed_ms': 0,
+            'success': False,
+            'error': f'Error calling Copilot: {str(e)}'
+        }
+
+
+def _cache_path(prompt: str) -> str:
+    digest = hashlib.blake2b(prompt.encode('utf-8', errors='replace'), digest_size=16).hexdigest()
+    return os.path.join(_RESULT_CACHE_DIR, digest + '.json')
+
+
+def _cache_get(prompt: str):
+    """Return a previously cached, unexpired result dict for this prompt, or None."""
+    path = _cache_path(prompt)
+    try:
+        if time.time() - os.path.getmtime(path) > _RESULT_CACHE_TTL:
+            os.remove(path)
+            return None
+        with open(path, encoding='utf-8') as f:
+            result = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(result, dict):
+        return None
+    result['cached'] = True
+    return result
+
+
+def _cache_prune() -> None:
+    """Drop the oldest entries once the cache holds more than _RESULT_CACHE_MAX_ENTRIES."""
+    try:
+        with os.scandir(_RESULT_CACHE_DIR) as it:
+            entries = [(e.stat().st_mtime, e.path) for e in it if e.name.endswith('.json')]
+    except OSError:
+        return
+    if len(entries) <= _RESULT_CACHE_MAX_ENTRIES:
+        return
+    entries.sort()
+    for _, path in entries[:-_RESULT_CACHE_MAX_ENTRIES]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _cache_put(prompt: str, result: dict) -> None:
+    """Store a successful result. Cache write failures are never fatal."""
+    if not result.get('success'):
+        return
+    path = _cache_path(prompt)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(_RESULT_CACHE_DIR, exist_ok=True)
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(result, f)
+        os.replace(tmp, path)
+    except (OSError, TypeError, ValueError):
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        return
+    _cache_prune()
+
+
+def call_copilot_cached(prompt, timeout=60, refresh=False):
+    """call_copilot() backed by the on-disk result cache.
+
+    refresh=True skips the cached answer and stores the new one in its place.
+    Cached results carry 'cached': True.
+    """
+    result = None if refresh else _cache_get(prompt)
+    if result is None:
+        result = call_copilot(prompt, timeout=timeout)
+        _cache_put(prompt, result)
+    return result
+
+
+async def call_copilot_cached_async(prompt, timeout=60, refresh=False):
+    """Async call_copilot_cached(); the cache file I/O runs in a worker thread."""
+    result = None if refresh else await asyncio.to_thread(_cache_get, prompt)
+    if result is None:
+        result = await call_copilot_async(prompt, timeout=timeout)
+        await asyncio.to_thread(_cache_put, prompt, result)
+    return result
+
+
+# The longest prompt passed inline as one `gh copilot -p` argument. Linux
+# rejects a single argument over 128 KiB (MAX_ARG_STRLEN) and Windows a command
+# line over 32,767 characters; bigger sources go through a temp file instead.
+_INLINE_PROMPT_MAX = 30_000 if os.name == 'nt' else 100_000
+
+
+def _fits_inline(prompt: str) -> bool:
+    if os.name == 'nt':
+        return len(prompt) <= _INLINE_PROMPT_MAX
+    # UTF-8 needs at most 4 bytes per character, so short prompts skip the encode
+    return (len(prompt) * 4 <= _INLINE_PROMPT_MAX
+            or len(prompt.encode('utf-8', errors='replace')) <= _INLINE_PROMPT_MAX)
+
+
+def _call_with_source(source, described, instructions, suffix, cached=False, refresh=False):
+    """Ask Copilot `instructions` about `source`, described as e.g. "a py file named 'x.py'".
+
+    The source is inlined in the prompt while it fits in one argument;
+    otherwise it is written to a temp file that Copilot is told to read.
+    Cached results are keyed on the inline prompt either way; refresh=True
+    bypasses the cached answer as in call_copilot_cached().
+    """
+    prompt = f"Here is {described}:\n\n{source}\n\n{instructions}"
+    if _fits_inline(prompt):
+        return call_copilot_cached(prompt, refresh=refresh) if cached else call_copilot(prompt)
+
+    if cached and not refresh:
+        result = _cache_get(prompt)
+        if result is not None:
+            return result
+    with tempfile.NamedTemporaryFile(mode='w', suffix=suffix, delete=False, encoding='utf-8') as f:
+        f.write(source)
+        temp_path = f.name
+    try:
+        result = call_copilot(f"Read {described} at '{temp_path}'.\n{instructions}")
     finally:
         try:
-            os.unlink(temp_path)  # Cleanup
-        except:
+            os.unlink(temp_path)
+        except OSError:
             pass
+    if cached:
+        _cache_put(prompt, result)
+    return result
+
+
+def summarize_file(file_content, filename, refresh=False):
+    """Mode A: Generates a high-level overview."""
+    clean_code, trunc_meta = sanitize_code(file_content, filename=filename)
+    ext = _file_suffix(filename).lstrip('.') or 'text'
+
+    instructions = (
+        "Act as a patient teacher explaining it to a junior developer.\n"
+        "Cover:\n"
+        "1. WHAT IT DOES — plain language summary\n"
+        "2. KEY CONCEPTS — programming concepts used\n"
+        "3. BEST PRACTICES — good things this code demonstrates\n"
+        "4. LEARNING OPPORTUNITY — one thing to study further\n"
+        "Keep it clear, friendly, and beginner-accessible."
+    )
+    result = _call_with_source(clean_code, f"a {ext} file named '{filename}'", instructions,
+                               _file_suffix(filename), cached=True, refresh=refresh)
+    result['truncation'] = trunc_meta
+    return result
+
+
+# Lockfiles / generated output that only add noise to a diff review
+_DIFF_SKIP_RE = re.compile('|'.join(map(re.escape, (
+    'package-lock.json', 'yarn.lock', 'Pipfile.lock',
+    'poetry.lock', 'Gemfile.lock', '.min.js', '.min.css',
+    '.map', 'dist/', 'build/', 'coverage/',
+))))
 
 
 def sanitize_diff(raw_diff: str) -> tuple:
     """Filter lockfiles/generated files and truncate to 400 code lines."""
-    SKIP_PATTERNS = (
-        'package-lock.json', 'yarn.lock', 'Pipfile.lock',
-        'poetry.lock', 'Gemfile.lock', '.min.js', '.min.css',
-        '.map', 'dist/', 'build/', 'coverage/',
-    )
     MAX_CODE_LINES = 400
 
     sections = raw_diff.split('\ndiff --git ')
@@ -249,36 +511,31 @@ def sanitize_diff(raw_diff: str) -> tuple:
     for i, section in enumerate(sections):
         header = ('diff --git ' + section) if i > 0 else section
         # Check if this section is a file we should skip
-        first_line = section.split('\n')[0]
-        if any(pat in first_line for pat in SKIP_PATTERNS):
+        first_line = section.partition('\n')[0]
+        if _DIFF_SKIP_RE.search(first_line):
             continue
         kept_sections.append(header)
         files_changed += 1
 
     clean_diff = '\n'.join(kept_sections)
 
-    # Count and truncate actual code lines
+    # Count code lines and collect the truncated view in the same pass
     meta_prefixes = ('+++', '---', '@@', 'diff --git', 'index ', 'new file', 'deleted file')
     total_code = 0
+    truncated_lines = []
     for line in clean_diff.splitlines():
-        is_meta = any(line.startswith(p) for p in meta_prefixes)
+        is_meta = line.startswith(meta_prefixes)
         if not is_meta:
             total_code += 1
-            if line.startswith('+') and not line.startswith('+++'):
+            # '+++' / '---' headers are already excluded as meta lines
+            if line.startswith('+'):
                 lines_added += 1
-            elif line.startswith('-') and not line.startswith('---'):
+            elif line.startswith('-'):
                 lines_removed += 1
+        if total_code <= MAX_CODE_LINES:
+            truncated_lines.append(line)
 
     if total_code > MAX_CODE_LINES:
-        truncated_lines = []
-        code_count = 0
-        for line in clean_diff.splitlines():
-            is_meta = any(line.startswith(p) for p in meta_prefixes)
-            if not is_meta:
-                code_count += 1
-                if code_count > MAX_CODE_LINES:
-                    break
-            truncated_lines.append(line)
         clean_diff = '\n'.join(truncated_lines)
         clean_diff += f'\n\n[Truncated: showing {MAX_CODE_LINES} of {total_code} code lines]'
 
@@ -291,34 +548,26 @@ def sanitize_diff(raw_diff: str) -> tuple:
     return clean_diff, metadata
 
 
-def review_file(file_content: str, filename: str) -> dict:
+def review_file(file_content: str, filename: str, refresh: bool = False) -> dict:
     """Review mode: senior developer code review of a file."""
-    clean_code, trunc_meta = sanitize_code(file_content)
-
-    with tempfile.NamedTemporaryFile(mode='w', suffix=_file_suffix(filename), delete=False, encoding='utf-8') as f:
-        f.write(clean_code)
-        temp_path = f.name
-
-    try:
-        prompt = (
-            f"Read the file at '{temp_path}'. You are a senior developer doing a thorough code review.\n"
-            "Check for:\n"
-            "1. BUGS — logic errors, edge cases, off-by-one, null/undefined handling\n"
-            "2. QUALITY — naming, readability, dead code, overly complex logic\n"
-            "3. SECURITY — injection, hardcoded secrets, missing input validation\n"
-            "4. PERFORMANCE — unnecessary loops, repeated work, memory issues\n"
-            "5. TESTS — which functions lack test coverage and why they need it\n"
-            "End with a QUALITY SCORE (0-10) and a one-line verdict: "
-            "Production Ready / Needs Work / Major Issues."
-        )
-        result = call_copilot(prompt)
-        result['truncation'] = trunc_meta
-        return result
-    finally:
-        try:
-            os.unlink(temp_path)
-        except:
-            pass
+    clean_code, trunc_meta = sanitize_code(file_content, filename=filename)
+    ext = _file_suffix(filename).lstrip('.') or 'text'
+
+    instructions = (
+        "You are a senior developer doing a thorough code review.\n"
+        "Check for:\n"
+        "1. BUGS — logic errors, edge cases, off-by-one, null/undefined handling\n"
+        "2. QUALITY — naming, readability, dead code, overly complex logic\n"
+        "3. SECURITY — injection, hardcoded secrets, missing input validation\n"
+        "4. PERFORMANCE — unnecessary loops, repeated work, memory issues\n"
+        "5. TESTS — which functions lack test coverage and why they need it\n"
+        "End with a QUALITY SCORE (0-10) and a one-line verdict: "
+        "Production Ready / Needs Work / Major Issues."
+    )
+    result = _call_with_source(clean_code, f"a {ext} file named '{filename}'", instructions,
+                               _file_suffix(filename), cached=True, refresh=refresh)
+    result['truncation'] = trunc_meta
+    return result
 
 
 def review_diff(diff_content: str) -> dict:
@@ -332,28 +581,18 @@ def review_diff(diff_content: str) -> dict:
             'success': True, 'error': None,
         }
 
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.diff', delete=False, encoding='utf-8') as f:
-        f.write(clean_diff)
-        temp_path = f.name
-
-    try:
-        prompt = (
-            f"Read the git diff at '{temp_path}'. You are a senior developer doing a pre-commit review.\n"
-            "Check for:\n"
-            "1. SECURITY — injection, secrets, missing validation\n"
-            "2. LOGIC — bugs, edge cases, division by zero\n"
-            "3. QUALITY — naming, readability, dead code\n"
-            "4. TESTS — missing test coverage for new functions\n"
-            "5. BREAKING CHANGES — API changes, renamed functions\n"
-            "Give a READINESS SCORE (0-10) and a one-line verdict: "
-            "Ready to Commit / Needs Minor Work / Do Not Merge."
-        )
-        return call_copilot(prompt)
-    finally:
-        try:
-            os.unlink(temp_path)
-        except:
-            pass
+    instructions = (
+        "You are a senior developer doing a pre-commit review.\n"
+        "Check for:\n"
+        "1. SECURITY — injection, secrets, missing validation\n"
+        "2. LOGIC — bugs, edge cases, division by zero\n"
+        "3. QUALITY — naming, readability, dead code\n"
+        "4. TESTS — missing test coverage for new functions\n"
+        "5. BREAKING CHANGES — API changes, renamed functions\n"
+        "Give a READINESS SCORE (0-10) and a one-line verdict: "
+        "Ready to Commit / Needs Minor Work / Do Not Merge."
+    )
+    return _call_with_source(clean_diff, "a staged git diff", instructions, '.diff')
 
 
 def resolve_conflicts(file_content: str, filename: str) -> dict:
@@ -361,36 +600,28 @@ def resolve_conflicts(file_content: str, filename: str) -> dict:
     from codesensei.scanner import extract_conflicts
     conflicts = extract_conflicts(file_content)
     conflict_count = len(conflicts)
-
-    with tempfile.NamedTemporaryFile(mode='w', suffix=_file_suffix(filename), delete=False, encoding='utf-8') as f:
-        f.write(file_content)
-        temp_path = f.name
-
-    try:
-        prompt = (
-            f"Read the file at '{temp_path}'. It contains {conflict_count} git merge conflict(s). "
-            "Do NOT ask any follow-up questions. Do NOT ask if I want you to solve them. "
-            "Just immediately provide the full analysis and resolution now.\n\n"
-            "For EACH conflict block (<<<<<<< HEAD ... >>>>>>> branch), output:\n"
-            "1. CURRENT BRANCH — one sentence: what this code does\n"
-            "2. INCOMING BRANCH — one sentence: what this code does\n"
-            "3. RECOMMENDATION — which side to keep and exactly why\n"
-            "4. RESOLVED — the resolved code snippet with no conflict markers\n\n"
-            "Be concise and decisive. If both sides are needed, show the merged result."
-        )
-        result = call_copilot(prompt)
-        result['conflict_count'] = conflict_count
-        return result
-    finally:
-        try:
-            os.unlink(temp_path)
-        except:
-            pass
-
+    ext = _file_suffix(filename).lstrip('.') or 'text'
+
+    instructions = (
+        f"It contains {conflict_count} git merge conflict(s). "
+        "Do NOT ask any follow-up questions. Do NOT ask if I want you to solve them. "
+        "Just immediately provide the full analysis and resolution now.\n\n"
+        "For EACH conflict block (<<<<<<< HEAD ... >>>>>>> branch), output:\n"
+        "1. CURRENT BRANCH — one sentence: what this code does\n"
+        "2. INCOMING BRANCH — one sentence: what this code does\n"
+        "3. RECOMMENDATION — which side to keep and exactly why\n"
+        "4. RESOLVED — the resolved code snippet with no conflict markers\n\n"
+        "Be concise and decisive. If both sides are needed, show the merged result."
+    )
+    # Sent unsanitized: every conflict block counted above must reach Copilot
+    result = _call_with_source(file_content, f"a {ext} file named '{filename}'", instructions,
+                               _file_suffix(filename))
+    result['conflict_count'] = conflict_count
+    return result
 
 
-def blueprint_file(file_content: str, filename: str, structure: dict) -> dict:
-    """Blueprint Mode: architectural analysis of a single file."""
+def _blueprint_file_prompt(file_content: str, filename: str, structure: dict) -> tuple:
+    """Return (prompt, skeleton_lines, strip_tooluse) for a file-level blueprint."""
     from codesensei.scanner import format_blueprint
     skeleton_lines = format_blueprint(structure, filename)
 
@@ -411,31 +642,60 @@ def blueprint_file(file_content: str, filename: str, structure: dict) -> dict:
             "4. RECOMMENDATIONS — concrete refactoring suggestions (max 3, most impactful first)\n"
             "Be concise and decisive. No bullet padding."
         )
-        result = call_copilot(prompt)
-        result['skeleton'] = skeleton_lines
-        return result
-    else:
-        # Unsupported language — embed raw source inline (avoids agentic read-then-ask loop)
-        clean_code, _ = sanitize_code(file_content)
-        ext = _file_suffix(filename).lstrip('.') or 'text'
-        prompt = (
-            f"You are a senior software architect reviewing a {ext} file named '{filename}'.\n"
-            f"Here is the complete source:\n\n{clean_code}\n\n"
-            "Immediately provide:\n"
-            "1. STRUCTURE — list every class, its methods, and every top-level function with signatures\n"
-            "2. RESPONSIBILITIES — one line per class/module on what it owns\n"
-            "3. DESIGN CONCERNS — SRP violations, god objects, bad coupling, missing abstractions\n"
-            "4. RECOMMENDATIONS — top 3 most impactful refactoring suggestions\n"
-            "Be concise and decisive. No padding."
-        )
-        result = call_copilot(prompt)
-        if result.get('success') and result.get('response'):
-            result['response'] = _strip_tooluse(result['response'])
-        result['skeleton'] = skeleton_lines
-        return result
+        return prompt, skeleton_lines, False
+
+    # Unsupported language — embed raw source inline (avoids agentic read-then-ask loop)
+    clean_code, _ = sanitize_code(file_content, filename=filename)
+    ext = _file_suffix(filename).lstrip('.') or 'text'
+    prompt = (
+        f"You are a senior software architect reviewing a {ext} file named '{filename}'.\n"
+        f"Here is the complete source:\n\n{clean_code}\n\n"
+        "Immediately provide:\n"
+        "1. STRUCTURE — list every class, its methods, and every top-level function with signatures\n"
+        "2. RESPONSIBILITIES — one line per class/module on what it owns\n"
+        "3. DESIGN CONCERNS — SRP violations, god objects, bad coupling, missing abstractions\n"
+        "4. RECOMMENDATIONS — top 3 most impactful refactoring suggestions\n"
+        "Be concise and decisive. No padding."
+    )
+    return prompt, skeleton_lines, True
+
+
+def _finish_blueprint(result: dict, skeleton_lines: list, strip_tooluse: bool) -> dict:
+    if strip_tooluse and result.get('success') and result.get('response'):
+        result['response'] = _strip_tooluse(result['response'])
+    result['skeleton'] = skeleton_lines
+    return result
+
+
+def blueprint_file(file_content: str, filename: str, structure: dict, refresh: bool = False) -> dict:
+    """Blueprint Mode: architectural analysis of a single file."""
+    prompt, skeleton_lines, strip = _blueprint_file_prompt(file_content, filename, structure)
+    result = call_copilot_cached(prompt, refresh=refresh)
+    return _finish_blueprint(result, skeleton_lines, strip)
 
 
-def blueprint_project(project: dict, project_name: str) -> dict:
+# Copilot calls blueprint_files_async() keeps in flight at once
+_BLUEPRINT_CONCURRENCY = 4
+
+
+async def blueprint_files_async(files, refresh: bool = False) -> list:
+    """Blueprint several files at once, at most _BLUEPRINT_CONCURRENCY Copilot calls at a time.
+
+    `files` is an iterable of (file_content, filename, structure) tuples.
+    Returns one blueprint_file()-shaped result per file, in input order.
+    """
+    limit = asyncio.Semaphore(_BLUEPRINT_CONCURRENCY)
+
+    async def _one(file_content, filename, structure):
+        prompt, skeleton_lines, strip = _blueprint_file_prompt(file_content, filename, structure)
+        async with limit:
+            result = await call_copilot_cached_async(prompt, refresh=refresh)
+        return _finish_blueprint(result, skeleton_lines, strip)
+
+    return list(await asyncio.gather(*(_one(*f) for f in files)))
+
+
+def blueprint_project(project: dict, project_name: str, refresh: bool = False) -> dict:
     """Blueprint Mode: architectural analysis of an entire project's class structure."""
     from codesensei.scanner import format_project_blueprint
 
@@ -443,16 +703,12 @@ def blueprint_project(project: dict, project_name: str) -> dict:
     skeleton_text = '\n'.join(skeleton_lines)
 
     # Build a compact summary for the Copilot prompt (names + bases + method counts only)
-    compact_parts = []
-    for cls in project['all_classes']:
-        bases_str = f"({', '.join(cls['bases'])})" if cls['bases'] else ""
-        method_names = [m['name'] for m in cls['methods']]
-        compact_parts.append(
-            f"  [{cls['file']}] class {cls['name']}{bases_str}: "
-            f"{', '.join(method_names) if method_names else 'no methods'}"
-        )
-
-    compact_skeleton = '\n'.join(compact_parts) if compact_parts else "(no classes found — procedural codebase)"
+    compact_skeleton = '\n'.join(
+        f"  [{cls['file']}] class {cls['name']}"
+        f"{'(' + ', '.join(cls['bases']) + ')' if cls['bases'] else ''}: "
+        f"{', '.join(m['name'] for m in cls['methods']) or 'no methods'}"
+        for cls in project['all_classes']
+    ) or "(no classes found — procedural codebase)"
 
     prompt = (
         f"You are a senior software architect reviewing the class structure of a project called '{project_name}'.\n"
@@ -467,7 +723,7 @@ def blueprint_project(project: dict, project_name: str) -> dict:
         "Be concise and decisive. No padding."
     )
 
-    result = call_copilot(prompt)
+    result = call_copilot_cached(prompt, refresh=refresh)
     if result.get('success') and result.get('response'):
         result['response'] = _strip_tooluse(result['response'])
     result['skeleton'] = skeleton_lines
@@ -476,26 +732,18 @@ def blueprint_project(project: dict, project_name: str) -> dict:
 
 def devil_analyze(file_content, filename):
     """Mode B (Devil's Advocate): Aggressive security analysis."""
-    clean_code, trunc_meta = sanitize_code(file_content)
-
-    with tempfile.NamedTemporaryFile(mode='w', suffix=_file_suffix(filename), delete=False, encoding='utf-8') as f:
-        f.write(clean_code)
-        temp_path = f.name
-
-    try:
-        prompt = (
-            f"Read the file at '{temp_path}'. You are a penetration tester doing a hostile security review.\n"
-            "Find: SQL injection, hardcoded secrets, missing input validation, "
-            "logic bugs, race conditions, weak crypto, insecure defaults.\n"
-            "For each issue: rate severity (HIGH/MEDIUM/LOW), give the line number, "
-            "show an exploit example, and suggest a specific fix.\n"
-            "If no issues found, say: NO ISSUES FOUND."
-        )
-        result = call_copilot(prompt)
-        result['truncation'] = trunc_meta
-        return result
-    finally:
-        try:
-            os.unlink(temp_path)
-        except:
-            pass
+    clean_code, trunc_meta = sanitize_code(file_content, filename=filename)
+    ext = _file_suffix(filename).lstrip('.') or 'text'
+
+    instructions = (
+        "You are a penetration tester doing a hostile security review of it.\n"
+        "Find: SQL injection, hardcoded secrets, missing input validation, "
+        "logic bugs, race conditions, weak crypto, insecure defaults.\n"
+        "For each issue: rate severity (HIGH/MEDIUM/LOW), give the line number, "
+        "show an exploit example, and suggest a specific fix.\n"
+        "If no issues found, say: NO ISSUES FOUND."
+    )
+    result = _call_with_source(clean_code, f"a {ext} file named '{filename}'", instructions,
+                               _file_suffix(filename))
+    result['truncation'] = trunc_meta
+    return result
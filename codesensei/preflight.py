@@ -5,15 +5,39 @@ Verifies Python version, gh CLI, Copilot extension, and auth.
 import sys
 import subprocess
 import os
+import json
+import time
+import shutil
+import hashlib
+import shlex
+from concurrent.futures import ThreadPoolExecutor
+
+# A fully passing preflight is remembered for a day so repeat launches skip
+# the gh subprocess checks. The key changes whenever Python, PATH or the gh
+# binary itself changes, which invalidates the cache automatically.
+_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "codesensei", "preflight.json")
+_CACHE_TTL = 24 * 60 * 60
+
+_GH_VERSION_CMD = ["gh", "--version"]
+_COPILOT_VERSION_CMD = ["gh", "copilot", "--version"]
+# `gh auth token` only reads the locally stored token; `gh auth status`
+# would make a round trip to the GitHub API on every launch.
+_GH_AUTH_CMD = ["gh", "auth", "token"]
+
+# Stop gh from running its own update checks during preflight
+_GH_ENV = {**os.environ, "GH_NO_UPDATE_NOTIFIER": "1", "GH_NO_EXTENSION_UPDATE_NOTIFIER": "1"}
 
 
 def _run(cmd, timeout=5):
     """Run a command silently. Returns (returncode, stdout, stderr)."""
+    # A PATH lookup is far cheaper than fork+exec just to hit FileNotFoundError
+    if shutil.which(cmd[0]) is None:
+        return -1, "", "not found"
     flags = subprocess.CREATE_NO_WINDOW if os.name == "nt" else 0
     try:
         r = subprocess.run(
             cmd, capture_output=True, text=True,
-            encoding="utf-8", timeout=timeout, creationflags=flags
+            encoding="utf-8", timeout=timeout, creationflags=flags, env=_GH_ENV
         )
         return r.returncode, r.stdout.strip(), r.stderr.strip()
     except FileNotFoundError:
@@ -22,6 +46,96 @@ def _run(cmd, timeout=5):
         return -2, "", "timed out"
 
 
+def _run_concurrent(cmds):
+    """Run the first command, then the rest in parallel threads if it passed.
+
+    The first command is the prerequisite (gh itself); the remaining checks
+    only block on subprocess I/O, so overlapping them hides their latency.
+    """
+    first, _, _ = _run(cmds[0])
+    if first != 0 or len(cmds) == 1:
+        return [first] * len(cmds)
+    with ThreadPoolExecutor(max_workers=len(cmds) - 1) as ex:
+        rest = [f.result()[0] for f in [ex.submit(_run, cmd) for cmd in cmds[1:]]]
+    return [first] + rest
+
+
+def _run_batched(cmds, timeout=15):
+    """Run several commands in one shell process. Returns a list of return codes.
+
+    Each command's output is discarded and its exit status is echoed after a
+    __STEP<i>__ sentinel, so one fork+exec covers every check. The first
+    command runs on its own; the rest run as parallel background jobs. Falls
+    back to _run_concurrent where no POSIX shell is available.
+    """
+    if shutil.which(cmds[0][0]) is None:
+        return [-1] * len(cmds)
+    if os.name == "nt":
+        return _run_concurrent(cmds)
+
+    steps = [f"{shlex.join(cmd)} >/dev/null 2>&1; echo __STEP{i}__$?" for i, cmd in enumerate(cmds)]
+    script = steps[0]
+    if len(steps) > 1:
+        script += "; " + " ".join(f"( {step} ) &" for step in steps[1:]) + " wait"
+    code, out, _ = _run(["sh", "-c", script], timeout=timeout)
+    if code == -1:
+        return _run_concurrent(cmds)
+
+    codes = [code if code < 0 else -1] * len(cmds)
+    for line in out.splitlines():
+        if not line.startswith("__STEP"):
+            continue
+        step, _, status = line[6:].partition("__")
+        try:
+            codes[int(step)] = int(status)
+        except (ValueError, IndexError):
+            pass
+    return codes
+
+
+def _preflight_cache_key():
+    """Return a hash identifying the current toolchain (Python, PATH, gh binary)."""
+    gh_path = shutil.which("gh")
+    try:
+        gh_mtime = os.path.getmtime(gh_path) if gh_path else 0
+    except OSError:
+        gh_mtime = 0
+    raw = f"{sys.version}\0{os.environ.get('PATH', '')}\0{gh_path}\0{gh_mtime}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _cache_is_warm(key):
+    """Return True if the cached preflight result matches key and is fresh."""
+    try:
+        with open(_CACHE_PATH, encoding="utf-8") as f:
+            data = json.load(f)
+        ts = data.get("ts", 0)
+    except (OSError, ValueError, AttributeError):
+        return False
+    # A hand-edited or corrupt file may hold any JSON value here
+    if not isinstance(ts, (int, float)) or isinstance(ts, bool):
+        return False
+    return data.get("key") == key and time.time() - ts < _CACHE_TTL
+
+
+def _cache_write(key):
+    """Record a fully passing preflight. Failures here are never fatal."""
+    try:
+        os.makedirs(os.path.dirname(_CACHE_PATH), exist_ok=True)
+        with open(_CACHE_PATH, "w", encoding="utf-8") as f:
+            json.dump({"key": key, "ts": time.time()}, f)
+    except OSError:
+        pass
+
+
+def _cache_clear():
+    """Drop the cached preflight result so the next launch re-checks everything."""
+    try:
+        os.remove(_CACHE_PATH)
+    except OSError:
+        pass
+
+
 def check_python_version():
     if sys.version_info < (3, 10):
         return False, (
@@ -31,8 +145,9 @@ def check_python_version():
     return True, None
 
 
-def check_gh_installed():
-    code, _, _ = _run(["gh", "--version"])
+def check_gh_installed(code=None):
+    if code is None:
+        code, _, _ = _run(_GH_VERSION_CMD)
     if code != 0:
         return False, (
             "GitHub CLI (gh) is not installed.\n"
@@ -44,8 +159,9 @@ def check_gh_installed():
     return True, None
 
 
-def check_copilot_extension():
-    code, _, _ = _run(["gh", "copilot", "--version"])
+def check_copilot_extension(code=None):
+    if code is None:
+        code, _, _ = _run(_COPILOT_VERSION_CMD)
     if code != 0:
         return False, (
             "GitHub Copilot CLI extension is not installed.\n"
@@ -54,8 +170,9 @@ def check_copilot_extension():
     return True, None
 
 
-def check_gh_auth():
-    code, _, _ = _run(["gh", "auth", "status"])
+def check_gh_auth(code=None):
+    if code is None:
+        code, _, _ = _run(_GH_AUTH_CMD)
     if code != 0:
         return False, (
             "Not authenticated with GitHub.\n"
@@ -72,52 +189,62 @@ def run_preflight() -> bool:
 
     Checks are run in dependency order — if gh is not installed, the
     Copilot extension and auth checks are skipped to avoid misleading errors.
+    The three gh commands themselves are batched into a single shell call.
+
+    A clean pass is cached on disk (see _CACHE_PATH) and reused for 24h
+    while the toolchain key is unchanged; any failure clears the cache.
     """
+    cache_key = _preflight_cache_key()
+    if _cache_is_warm(cache_key):
+        return True
+
     errors = []
-    warnings = []
+    auth_msg = None
 
     # Step 1: Python version (no dependencies)
     ok, msg = check_python_version()
     if not ok:
         errors.append(("Python version", msg))
 
+    gh_code, copilot_code, auth_code = _run_batched(
+        [_GH_VERSION_CMD, _COPILOT_VERSION_CMD, _GH_AUTH_CMD]
+    )
+
     # Step 2: gh CLI (required for all subsequent checks)
-    gh_ok, gh_msg = check_gh_installed()
+    gh_ok, gh_msg = check_gh_installed(gh_code)
     if not gh_ok:
         errors.append(("GitHub CLI (gh)", gh_msg))
         # gh not found — skip extension and auth checks, they would all fail
         # and would produce misleading duplicate errors
     else:
         # Step 3: Copilot extension (only if gh is present)
-        ok, msg = check_copilot_extension()
+        ok, msg = check_copilot_extension(copilot_code)
         if not ok:
             errors.append(("Copilot CLI extension", msg))
 
-        # Step 4: GitHub auth (warn only, not blocking)
-        ok, msg = check_gh_auth()
-        if not ok:
-            warnings.append(("GitHub authentication", msg))
+        # Step 4: GitHub auth (warn only, not blocking) — the only warning source
+        ok, auth_msg = check_gh_auth(auth_code)
 
     if errors:
-        print("\n" + "=" * 52, file=sys.stderr)
-        print("  CodeSensei — Setup Required", file=sys.stderr)
-        print("=" * 52, file=sys.stderr)
-        for label, msg in errors:
-            print(f"\n  [MISSING] {label}", file=sys.stderr)
-            print(f"  {msg}", file=sys.stderr)
-        print("\n" + "=" * 52, file=sys.stderr)
-        print("  Fix the issues above, then run again.", file=sys.stderr)
-        print("=" * 52 + "\n", file=sys.stderr)
+        _cache_clear()
+        bar = "=" * 52
+        body = "".join(f"\n  [MISSING] {label}\n  {msg}\n" for label, msg in errors)
+        sys.stderr.write(
+            f"\n{bar}\n  CodeSensei — Setup Required\n{bar}\n{body}"
+            f"\n{bar}\n  Fix the issues above, then run again.\n{bar}\n\n"
+        )
         return False
 
-    if warnings:
-        print("\n" + "-" * 52, file=sys.stderr)
-        print("  CodeSensei — Warning", file=sys.stderr)
-        print("-" * 52, file=sys.stderr)
-        for label, msg in warnings:
-            print(f"\n  [WARNING] {label}", file=sys.stderr)
-            print(f"  {msg}", file=sys.stderr)
-        print("\n  CodeSensei will still launch but AI modes may fail.", file=sys.stderr)
-        print("-" * 52 + "\n", file=sys.stderr)
-
+    if auth_msg is None:
+        _cache_write(cache_key)
+        return True
+
+    # Keep showing the warning on every launch until it is resolved
+    _cache_clear()
+    bar = "-" * 52
+    sys.stderr.write(
+        f"\n{bar}\n  CodeSensei — Warning\n{bar}\n"
+        f"\n  [WARNING] GitHub authentication\n  {auth_msg}\n"
+        f"\n  CodeSensei will still launch but AI modes may fail.\n{bar}\n\n"
+    )
     return True
@@ -1,27 +1,119 @@
 import ast
+import json
+import re
 import pathlib
 import subprocess
 import os
+import functools
+import hashlib
+import threading
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+try:
+    import pygit2  # optional: in-process libgit2, avoids a git fork+exec per query
+except ImportError:
+    pygit2 = None
+
+try:
+    # optional: real JS/TS grammar instead of the line-based regex parser
+    import tree_sitter
+    import tree_sitter_javascript
+    import tree_sitter_typescript
+except ImportError:
+    tree_sitter = None
+
+# realpath -> True for directories already confirmed to be inside a work tree.
+# Only positive answers are kept so a later `git init` is picked up.
+_REPO_CHECK_CACHE: dict = {}
+
+
+def reset_repo_cache() -> None:
+    """Forget which directories were confirmed as git work trees."""
+    _REPO_CHECK_CACHE.clear()
+    _STAGED_DIFF_CACHE.clear()
+    _GIT_PATHS_CACHE.clear()
+    _pygit2_repo.cache_clear()
+
+
+@functools.lru_cache(maxsize=8)
+def _pygit2_repo(realpath: str):
+    """Open (once) the pygit2 Repository containing realpath, or None."""
+    if pygit2 is None:
+        return None
+    try:
+        found = pygit2.discover_repository(realpath)
+        repo = pygit2.Repository(found) if found else None
+    except (pygit2.GitError, KeyError, ValueError):
+        return None
+    if repo is None or repo.is_bare or repo.head_is_unborn:
+        # Unborn HEAD has no tree to diff the index against — let the CLI handle it
+        return None
+    return repo
 
 
-def get_staged_diff(repo_path: str) -> dict:
-    """Run git diff --staged and return structured result."""
-    flags = subprocess.CREATE_NO_WINDOW if os.name == "nt" else 0
+def _pygit2_staged_diff(repo_path: str):
+    """Return the staged pygit2.Diff (HEAD tree → index) and path prefix, or (None, '').
 
-    # Check if it's a git repo
+    The prefix is repo_path relative to the work tree root ('' at the root,
+    otherwise ending in '/'), used to mimic `git diff --relative`.
+    """
+    realpath = os.path.realpath(repo_path)
+    repo = _pygit2_repo(realpath)
+    if repo is None:
+        return None, ''
+    try:
+        repo.index.read()  # pick up `git add` done since the repo was opened
+        diff = repo.index.diff_to_tree(repo.head.peel(pygit2.Tree))
+        diff.find_similar()  # rename detection, as `git diff` does by default
+    except pygit2.GitError:
+        return None, ''
+    rel = os.path.relpath(realpath, os.path.realpath(repo.workdir))
+    prefix = '' if rel == '.' else pathlib.PurePath(rel).as_posix() + '/'
+    return diff, prefix
+
+
+def _is_git_repo(repo_path: str) -> tuple:
+    """Return (is_git_repo, error) for repo_path, memoizing positive results."""
+    key = os.path.realpath(repo_path)
+    if _REPO_CHECK_CACHE.get(key):
+        return True, None
+    if _pygit2_repo(key) is not None:
+        _REPO_CHECK_CACHE[key] = True
+        return True, None
+
+    flags = subprocess.CREATE_NO_WINDOW if os.name == "nt" else 0
     try:
         check = subprocess.run(
             ["git", "rev-parse", "--is-inside-work-tree"],
             capture_output=True, text=True, encoding='utf-8',
             timeout=5, creationflags=flags, cwd=repo_path
         )
-        if check.returncode != 0:
-            return {'diff': '', 'has_changes': False, 'is_git_repo': False, 'error': None}
     except (FileNotFoundError, subprocess.TimeoutExpired):
-        return {'diff': '', 'has_changes': False, 'is_git_repo': False, 'error': 'git not found'}
+        return False, 'git not found'
+    if check.returncode != 0:
+        return False, None
+    _REPO_CHECK_CACHE[key] = True
+    return True, None
+
+
+def get_staged_diff(repo_path: str) -> dict:
+    """Run git diff --staged and return structured result."""
+    flags = subprocess.CREATE_NO_WINDOW if os.name == "nt" else 0
+
+    # Check if it's a git repo
+    is_repo, error = _is_git_repo(repo_path)
+    if not is_repo:
+        return {'diff': '', 'has_changes': False, 'is_git_repo': False, 'error': error}
 
     # Get staged diff
     try:
+        diff_obj, _ = _pygit2_staged_diff(repo_path)
+        if diff_obj is not None:
+            diff = diff_obj.patch.strip() if diff_obj.patch else ''
+            return {'diff': diff, 'has_changes': bool(diff), 'is_git_repo': True, 'error': None}
+
         result = subprocess.run(
             ["git", "diff", "--staged"],
             capture_output=True, text=True, encoding='utf-8',
@@ -48,25 +140,205 @@ def format_size(size_bytes):
 
 
 def get_staged_files(repo_path: str) -> list:
-    """Return list of relative paths that are currently staged."""
-    flags = subprocess.CREATE_NO_WINDOW if os.name == "nt" else 0
+    """Return list of staged paths, relative to repo_path."""
+    try:
+        return list(get_staged_state(repo_path)['files'])
+    except Exception:
+        return []
+
+
+# realpath -> (state key, staged state) from the last whole-repo diff
+_STAGED_DIFF_CACHE: dict = {}
+
+# realpath -> (index file, git dir, common git dir) as reported by git, so
+# worktrees and submodules (where '.git' is a file) resolve to their own index
+_GIT_PATHS_CACHE: dict = {}
+
+
+def _git_paths(repo_path: str):
+    """Return (index path, git dir, common dir) for repo_path, or None."""
+    key = os.path.realpath(repo_path)
+    paths = _GIT_PATHS_CACHE.get(key)
+    if paths is None:
+        flags = subprocess.CREATE_NO_WINDOW if os.name == "nt" else 0
+        try:
+            result = subprocess.run(
+                ["git", "rev-parse", "--git-path", "index", "--git-dir", "--git-common-dir"],
+                capture_output=True, text=True, encoding='utf-8',
+                timeout=5, creationflags=flags, cwd=repo_path
+            )
+        except (OSError, subprocess.SubprocessError):
+            return None
+        lines = result.stdout.splitlines()
+        if result.returncode != 0 or len(lines) != 3:
+            return None
+        # Relative answers are relative to the directory git ran in
+        paths = tuple(os.path.join(key, line) for line in lines)
+        _GIT_PATHS_CACHE[key] = paths
+    return paths
+
+
+def _read_head(git_dir: str, common_dir: str) -> str:
+    """Return the commit HEAD points at ('' if unborn or unreadable), without running git."""
+    try:
+        with open(os.path.join(git_dir, 'HEAD'), encoding='utf-8') as f:
+            head = f.read().strip()
+    except OSError:
+        return ''
+    if not head.startswith('ref: '):
+        return head  # detached HEAD holds the oid itself
+    ref = head[5:]
+    try:
+        with open(os.path.join(common_dir, ref), encoding='utf-8') as f:
+            return f.read().strip()
+    except OSError:
+        pass
+    try:
+        with open(os.path.join(common_dir, 'packed-refs'), encoding='utf-8') as f:
+            for line in f:
+                oid, _, name = line.rstrip('\n').partition(' ')
+                if name == ref:
+                    return oid
+    except OSError:
+        pass
+    return ''
+
+
+def _staged_state_key(repo_path: str):
+    """Return a key that changes whenever the staged diff can, or None if unknown.
+
+    The staged diff is HEAD's tree against the index, so the key combines the
+    index file's mtime and size with the commit HEAD resolves to.
+    """
+    repo = _pygit2_repo(os.path.realpath(repo_path))
+    if repo is not None:
+        index_path = os.path.join(repo.path, 'index')
+        try:
+            head = str(repo.head.target)
+        except pygit2.GitError:
+            return None
+    else:
+        paths = _git_paths(repo_path)
+        if paths is None:
+            return None
+        index_path, git_dir, common_dir = paths
+        head = _read_head(git_dir, common_dir)
     try:
+        st = os.stat(index_path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size, head
+
+
+def _diff_header_path(header: str) -> str:
+    """Extract the (new) path from a 'diff --git a/<path> b/<path>' header line."""
+    rest = header[len('diff --git '):]
+    half = (len(rest) - 1) // 2
+    # Unrenamed file: both sides are identical, which also copes with ' b/' in names
+    if rest.startswith('a/') and rest[half + 1:] == 'b/' + rest[2:half]:
+        return rest[2:half]
+    return rest.rsplit(' b/', 1)[-1]
+
+
+def _split_diff_by_file(diff: str, paths=None) -> dict:
+    """Split a multi-file unified diff into {path: diff_text}.
+
+    `paths` lists the files in patch order (from the -z raw records). git
+    still C-quotes unusual names in the 'diff --git' headers, so when the
+    counts agree the paths are taken from there instead of the headers.
+    """
+    sections = []
+    buf = None
+    for line in diff.splitlines():
+        if line.startswith('diff --git '):
+            if buf is not None:
+                sections.append('\n'.join(buf).strip())
+            buf = [line]
+        elif buf is not None:
+            buf.append(line)
+    if buf is not None:
+        sections.append('\n'.join(buf).strip())
+    if paths is not None and len(paths) == len(sections):
+        return dict(zip(paths, sections))
+    return {_diff_header_path(text.partition('\n')[0]): text for text in sections}
+
+
+def _split_raw_z(out: str) -> tuple:
+    """Split `git diff --patch-with-raw -z` output into (paths, patch text).
+
+    The raw section is a run of NUL-terminated ':<modes> <shas> <status>',
+    <path> (two paths for renames and copies) records, then a NUL, then the patch.
+    """
+    paths = []
+    pos = 0
+    while out.startswith(':', pos):
+        end = out.index('\0', pos)
+        status = out[pos:end].rsplit(' ', 1)[-1]
+        pos = end + 1
+        if status[:1] in ('R', 'C'):
+            pos = out.index('\0', pos) + 1  # skip the source path
+        end = out.index('\0', pos)
+        paths.append(out[pos:end])
+        pos = end + 1
+    if out.startswith('\0', pos):
+        pos += 1
+    return paths, out[pos:]
+
+
+def get_staged_state(repo_path: str) -> dict:
+    """Return {'files': [rel_path, ...], 'diffs': {rel_path: staged diff}}.
+
+    Paths are relative to repo_path and cover every staged file under it.
+    Uses pygit2 in-process when available, otherwise a single
+    `git diff --staged --relative --patch-with-raw -z` provides both the
+    file list and the per-file patches. The result is memoized per repo
+    until the index or HEAD changes (see _staged_state_key()).
+    Raises OSError / subprocess.SubprocessError if git cannot be run.
+    """
+    key = os.path.realpath(repo_path)
+    state_key = _staged_state_key(repo_path)
+    cached = _STAGED_DIFF_CACHE.get(key)
+    if cached and state_key is not None and cached[0] == state_key:
+        return cached[1]
+
+    diff_obj, prefix = _pygit2_staged_diff(repo_path)
+    if diff_obj is not None:
+        files = []
+        diffs = {}
+        for patch in diff_obj:
+            path = patch.delta.new_file.path
+            if not path.startswith(prefix):
+                continue
+            files.append(path[len(prefix):])
+            if patch.text:
+                diffs[path[len(prefix):]] = patch.text.strip()
+    else:
+        flags = subprocess.CREATE_NO_WINDOW if os.name == "nt" else 0
         result = subprocess.run(
-            ["git", "diff", "--staged", "--name-only"],
+            ["git", "-c", "core.quotePath=false", "diff", "--staged", "--relative",
+             "--patch-with-raw", "-z"],
             capture_output=True, text=True, encoding='utf-8',
-            timeout=5, creationflags=flags, cwd=repo_path
+            timeout=10, creationflags=flags, cwd=repo_path
         )
-        if result.returncode == 0:
-            return [f for f in result.stdout.strip().splitlines() if f]
-    except Exception:
-        pass
-    return []
+        files, patch_text = _split_raw_z(result.stdout)
+        diffs = _split_diff_by_file(patch_text, files)
+    state = {'files': tuple(files), 'diffs': diffs}
+    if state_key is not None:
+        _STAGED_DIFF_CACHE[key] = (state_key, state)
+    return state
+
+
+def get_all_staged_diffs(repo_path: str) -> dict:
+    """Return {rel_path: staged diff} for every staged file under repo_path.
+
+    Paths are relative to repo_path just like get_staged_diff_for_file().
+    See get_staged_state(), which this reads from.
+    """
+    return get_staged_state(repo_path)['diffs']
 
 
 def get_staged_diff_for_file(repo_path: str, file_path: str) -> dict:
     """Get staged diff for a specific file only."""
-    flags = subprocess.CREATE_NO_WINDOW if os.name == "nt" else 0
-
     # Get relative path of the file from repo root
     try:
         rel = pathlib.Path(file_path).resolve().relative_to(
@@ -76,24 +348,12 @@ def get_staged_diff_for_file(repo_path: str, file_path: str) -> dict:
     except ValueError:
         return {'diff': '', 'has_changes': False, 'is_git_repo': True, 'error': 'File is outside repo'}
 
-    try:
-        check = subprocess.run(
-            ["git", "rev-parse", "--is-inside-work-tree"],
-            capture_output=True, text=True, encoding='utf-8',
-            timeout=5, creationflags=flags, cwd=repo_path
-        )
-        if check.returncode != 0:
-            return {'diff': '', 'has_changes': False, 'is_git_repo': False, 'error': None}
-    except (FileNotFoundError, subprocess.TimeoutExpired):
-        return {'diff': '', 'has_changes': False, 'is_git_repo': False, 'error': 'git not found'}
+    is_repo, error = _is_git_repo(repo_path)
+    if not is_repo:
+        return {'diff': '', 'has_changes': False, 'is_git_repo': False, 'error': error}
 
     try:
-        result = subprocess.run(
-            ["git", "diff", "--staged", "--", rel_str],
-            capture_output=True, text=True, encoding='utf-8',
-            timeout=10, creationflags=flags, cwd=repo_path
-        )
-        diff = result.stdout.strip()
+        diff = get_all_staged_diffs(repo_path).get(rel_str, '')
         return {
             'diff': diff,
             'has_changes': bool(diff),
@@ -110,112 +370,343 @@ def has_merge_conflicts(file_content: str) -> bool:
     return '<<<<<<<' in file_content
 
 
+# One conflict block: a '<<<<<<<' line, the current side, a '=======' line,
+# the incoming side, and a '>>>>>>>' line. The sides cannot contain a new
+# '<<<<<<<' (which restarts the block) or their own closing marker.
+_CONFLICT_RE = re.compile(
+    r'^<<<<<<<(?P<branch>[^\n]*)\n'
+    r'(?P<current>(?:(?!<<<<<<<|=======)[^\n]*\n)*)'
+    r'=======[^\n]*\n'
+    r'(?P<incoming>(?:(?!<<<<<<<|>>>>>>>)[^\n]*\n)*)'
+    r'>>>>>>>',
+    re.MULTILINE,
+)
+
+
 def extract_conflicts(file_content: str) -> list:
     """Parse conflict markers and return a list of conflict dicts.
 
     Each dict has keys: 'current' (HEAD side), 'incoming' (branch side), 'branch' (branch name).
     """
-    conflicts = []
-    lines = file_content.split('\n')
-    state = None  # 'current' or 'incoming'
-    current_lines = []
-    incoming_lines = []
-    branch_name = ''
-
-    for line in lines:
-        if line.startswith('<<<<<<<'):
-            state = 'current'
-            current_lines = []
-            incoming_lines = []
-            branch_name = line[7:].strip()
-        elif line.startswith('=======') and state == 'current':
-            state = 'incoming'
-        elif line.startswith('>>>>>>>') and state == 'incoming':
-            conflicts.append({
-                'current': '\n'.join(current_lines),
-                'incoming': '\n'.join(incoming_lines),
-                'branch': branch_name,
-            })
-            state = None
-            current_lines = []
-            incoming_lines = []
-            branch_name = ''
-        elif state == 'current':
-            current_lines.append(line)
-        elif state == 'incoming':
-            incoming_lines.append(line)
+    if '<<<<<<<' not in file_content:
+        return []
+    return [
+        {
+            'current': m.group('current')[:-1],    # drop the final line's '\n'
+            'incoming': m.group('incoming')[:-1],
+            'branch': m.group('branch').strip(),
+        }
+        for m in _CONFLICT_RE.finditer(file_content)
+    ]
+
+
+# ── JS/TS parser patterns ─────────────────────────────────────────────────────
+# Imports: ES6 import or CommonJS require
+_JS_IMPORT_RE = re.compile(r'^\s*import\s+')
+_JS_REQUIRE_RE = re.compile(r'^\s*(?:const|let|var)\s+\S.*?=\s*require\s*\(')
+
+# Class: [export] [abstract] class Name [extends Base] [implements ...]
+_JS_CLASS_RE = re.compile(
+    r'^(?:export\s+(?:default\s+)?)?(?:abstract\s+)?class\s+(\w+)'
+    r'(?:\s+extends\s+([\w$.]+))?'
+    # implements list absorbs trailing whitespace itself: no nested \s runs
+    r'(?:\s+implements\s[\w,\s<>]+\{|\s*\{)'
+)
+
+# Method inside a class: must be indented, optional modifiers
+_JS_METHOD_RE = re.compile(
+    r'^( {2,}|\t+)'
+    r'(?:(?:public|private|protected|override|readonly|static|abstract|declare)\s+)*'
+    r'(?:async\s+)?(?:get\s+|set\s+)?'
+    r'(\w+)\s*[<(]'   # name followed by < (generic) or ( (params)
+)
+
+_JS_SKIP_KEYWORDS = frozenset((
+    'if', 'else', 'for', 'while', 'switch', 'catch', 'try', 'do',
+    'return', 'case', 'default', 'new', 'typeof', 'instanceof',
+    'throw', 'delete', 'void', 'yield', 'await',
+))
+
+# Top-level: function name(params) or async function name(params)
+_JS_FUNC_RE = re.compile(
+    r'^(?:export\s+(?:default\s+)?)?(?:async\s+)?function\s+(\w+)\s*\(([^)]*)\)'
+)
+# Top-level: const/let/var name = (...) => or = async (...) =>
+_JS_ARROW_RE = re.compile(
+    r'^(?:export\s+)?(?:const|let|var)\s+(\w+)\s*=\s*(?:async\s+)?(?:\([^)]*\)|[\w]+)\s*=>'
+)
+# Top-level: const name = function(...)
+_JS_CONST_FUNC_RE = re.compile(
+    r'^(?:export\s+)?(?:const|let|var)\s+(\w+)\s*=\s*(?:async\s+)?function\s*\('
+)
+# Parameter list of an arrow / function expression
+_JS_ARROW_ARGS_RE = re.compile(r'\(([^)]*)\)\s*(?:=>|{)')
+
+
+def _js_arrow_args(line: str) -> str:
+    """Return the first '(...)' parameter list followed by '=>' or '{', or ''.
+
+    Same result as _JS_ARROW_ARGS_RE.search(), but every '(' before a failed
+    ')' is skipped at once, keeping lines like '((((…' linear.
+    """
+    pos = 0
+    while True:
+        paren = line.find('(', pos)
+        if paren == -1:
+            return ''
+        m = _JS_ARROW_ARGS_RE.match(line, paren)
+        if m:
+            return m.group(1).strip()
+        close = line.find(')', paren)
+        if close == -1:
+            return ''
+        pos = close + 1
+
 
-    return conflicts
+# Shared by the regex parsers
+_ASYNC_RE = re.compile(r'\basync\b')
+
+# Tokens that matter for brace counting on a line that touches a template literal
+_JS_BRACE_TOKEN_RE = re.compile(r'\\.|//|\$\{|[`\'"{}]')
+
+
+def _count_code_braces(line: str, in_template: bool) -> tuple:
+    """Count the '{' and '}' on a JS/TS line that are outside string literals.
+
+    `in_template` says whether the line starts inside a multi-line template
+    literal; the returned tuple is (open, close, in_template at line end).
+    Lines with no backtick, outside a template, take the plain count() path.
+    """
+    if not in_template and '`' not in line:
+        return line.count('{'), line.count('}'), False
+    open_b = close_b = 0
+    quote = '`' if in_template else None
+    for m in _JS_BRACE_TOKEN_RE.finditer(line):
+        tok = m.group()
+        if quote:
+            if tok == quote:
+                quote = None
+        elif tok in ('`', "'", '"'):
+            quote = tok
+        elif tok == '//':
+            break
+        elif tok == '}':
+            close_b += 1
+        elif tok in ('{', '${'):
+            open_b += 1
+    return open_b, close_b, quote == '`'  # '/" strings end with the line
+
+
+@functools.lru_cache(maxsize=None)
+def _ts_language(suffix: str):
+    """Return the tree-sitter Language for a JS/TS suffix, or None if unavailable."""
+    if tree_sitter is None:
+        return None
+    try:
+        if suffix == '.ts':
+            raw = tree_sitter_typescript.language_typescript()
+        elif suffix == '.tsx':
+            raw = tree_sitter_typescript.language_tsx()
+        else:
+            raw = tree_sitter_javascript.language()  # grammar includes JSX
+        return tree_sitter.Language(raw)
+    except (AttributeError, TypeError, ValueError):
+        return None  # incompatible binding versions — use the regex parser
 
 
 def _parse_js_ts(content: str, filename: str) -> dict:
-    """Regex-based structural parser for JavaScript and TypeScript files.
+    """Structural parser for JavaScript and TypeScript files.
 
-    Returns the same dict shape as the Python AST parser so format_blueprint()
-    and blueprint_file() work identically for all languages.
+    Uses tree-sitter when it is installed and falls back to the regex parser
+    otherwise. Both return the same dict shape as the Python AST parser so
+    format_blueprint() and blueprint_file() work identically for all languages.
     """
-    import re
+    suffix = pathlib.Path(filename).suffix.lower()
+    language = _ts_language(suffix)
+    if language is not None:
+        return _parse_js_ts_tree(content, suffix, language)
+    return _parse_js_ts_regex(content, filename)
+
+
+_TS_CLASS_NODES = {'class_declaration', 'abstract_class_declaration', 'class'}
+_TS_METHOD_NODES = {'method_definition', 'method_signature', 'abstract_method_signature'}
+_TS_FUNC_NODES = {'function_declaration', 'generator_function_declaration'}
+_TS_FUNC_VALUE_NODES = {'arrow_function', 'function_expression', 'function', 'generator_function'}
+
+
+def _parse_js_ts_tree(content: str, suffix: str, language) -> dict:
+    """tree-sitter implementation of _parse_js_ts() (top-level declarations only)."""
+    src = content.encode('utf-8', errors='surrogatepass')
+    root = tree_sitter.Parser(language).parse(src).root_node
+
+    def text(node) -> str:
+        return src[node.start_byte:node.end_byte].decode('utf-8', errors='replace')
+
+    def first_line(node) -> str:
+        return text(node).split('\n', 1)[0].strip()
+
+    def params(node) -> str:
+        p = node.child_by_field_name('parameters') or node.child_by_field_name('parameter')
+        if p is None:
+            return ''
+        args = text(p).strip()
+        return args[1:-1].strip() if args.startswith('(') and args.endswith(')') else args
+
+    def is_async(node) -> bool:
+        return any(c.type == 'async' for c in node.children)
+
+    def entry(name, node) -> dict:
+        return {
+            'name': name,
+            'args': params(node),
+            'returns': '',
+            'lineno': node.start_point[0] + 1,
+            'is_async': is_async(node),
+        }
 
-    lines = content.splitlines()
     imports = []
     classes = []
     functions = []
+    seen_funcs = set()
 
-    # Imports: ES6 import or CommonJS require
-    IMPORT_RE = re.compile(r'^\s*import\s+')
-    REQUIRE_RE = re.compile(r'^\s*(?:const|let|var)\s+\S.*?=\s*require\s*\(')
-    for line in lines:
-        if IMPORT_RE.match(line) or REQUIRE_RE.match(line):
-            imports.append(line.strip())
-
-    # Class: [export] [abstract] class Name [extends Base] [implements ...]
-    CLASS_RE = re.compile(
-        r'^(?:export\s+(?:default\s+)?)?(?:abstract\s+)?class\s+(\w+)'
-        r'(?:\s+extends\s+([\w$.]+))?'
-        r'(?:\s+implements\s+[\w,\s<>]+)?'
-        r'\s*\{'
-    )
+    for node in root.named_children:
+        lineno = node.start_point[0] + 1
+        if node.type == 'export_statement':
+            decl = node.child_by_field_name('declaration')
+            if decl is None:
+                decl = next((c for c in node.named_children
+                             if c.type in _TS_CLASS_NODES | _TS_FUNC_NODES), None)
+            if decl is None:
+                continue
+            node = decl
 
-    # Method inside a class: must be indented, optional modifiers
-    METHOD_RE = re.compile(
-        r'^( {2,}|\t+)'
-        r'(?:(?:public|private|protected|override|readonly|static|abstract|declare)\s+)*'
-        r'(?:async\s+)?(?:get\s+|set\s+)?'
-        r'(\w+)\s*[<(]'   # name followed by < (generic) or ( (params)
-    )
+        if node.type == 'import_statement':
+            imports.append(first_line(node))
+
+        elif node.type in _TS_CLASS_NODES:
+            name_node = node.child_by_field_name('name')
+            if name_node is None:
+                continue
+            bases = []
+            for heritage in node.named_children:
+                if heritage.type != 'class_heritage':
+                    continue
+                for clause in heritage.named_children:
+                    if clause.type == 'extends_clause':  # TypeScript
+                        value = clause.child_by_field_name('value')
+                        if value is not None:
+                            bases.append(text(value))
+                    elif clause.type != 'implements_clause':  # JavaScript: bare expression
+                        bases.append(text(clause))
+                    break
+            methods = []
+            body = node.child_by_field_name('body')
+            for member in (body.named_children if body is not None else []):
+                if member.type in _TS_METHOD_NODES:
+                    m_name = member.child_by_field_name('name')
+                    if m_name is not None:
+                        methods.append(entry(text(m_name), member))
+            classes.append({
+                'name': text(name_node),
+                'bases': bases,
+                'lineno': lineno,
+                'methods': methods,
+            })
 
-    SKIP_KEYWORDS = {
-        'if', 'else', 'for', 'while', 'switch', 'catch', 'try', 'do',
-        'return', 'case', 'default', 'new', 'typeof', 'instanceof',
-        'throw', 'delete', 'void', 'yield', 'await',
+        elif node.type in _TS_FUNC_NODES:
+            name_node = node.child_by_field_name('name')
+            if name_node is not None and text(name_node) not in seen_funcs:
+                seen_funcs.add(text(name_node))
+                functions.append(entry(text(name_node), node))
+
+        elif node.type in ('lexical_declaration', 'variable_declaration'):
+            for decl in node.named_children:
+                if decl.type != 'variable_declarator':
+                    continue
+                name_node = decl.child_by_field_name('name')
+                value = decl.child_by_field_name('value')
+                if name_node is None or value is None:
+                    continue
+                if value.type == 'call_expression':
+                    fn = value.child_by_field_name('function')
+                    if fn is not None and text(fn) == 'require':
+                        imports.append(first_line(node))
+                elif value.type in _TS_FUNC_VALUE_NODES and text(name_node) not in seen_funcs:
+                    seen_funcs.add(text(name_node))
+                    functions.append({**entry(text(name_node), value), 'lineno': lineno})
+
+    return {
+        'supported': True,
+        'language': 'TypeScript' if suffix in ('.ts', '.tsx') else 'JavaScript',
+        'error': None,
+        'imports': imports[:8],
+        'classes': classes,
+        'functions': functions,
     }
 
-    # Top-level: function name(params) or async function name(params)
-    FUNC_RE = re.compile(
-        r'^(?:export\s+(?:default\s+)?)?(?:async\s+)?function\s+(\w+)\s*\(([^)]*)\)'
-    )
-    # Top-level: const/let/var name = (...) => or = async (...) =>
-    ARROW_RE = re.compile(
-        r'^(?:export\s+)?(?:const|let|var)\s+(\w+)\s*=\s*(?:async\s+)?(?:\([^)]*\)|[\w]+)\s*=>'
-    )
-    # Top-level: const name = function(...)
-    CONST_FUNC_RE = re.compile(
-        r'^(?:export\s+)?(?:const|let|var)\s+(\w+)\s*=\s*(?:async\s+)?function\s*\('
-    )
+
+# Inputs above this size are split lazily so the parsers never hold a full
+# list of lines; below it, splitlines() is faster and the list is small
+_STREAM_LINES_MIN = 1024 * 1024
+
+# The line boundaries str.splitlines() recognises, and those other than \n
+_LINE_BREAK_RE = re.compile(r'\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]')
+_RARE_BREAK_RE = re.compile(r'[\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]')
+
+
+def _iter_lines(content: str):
+    """Return an iterable over the lines of `content`, exactly as splitlines() splits them."""
+    if len(content) < _STREAM_LINES_MIN:
+        return content.splitlines()
+    if _RARE_BREAK_RE.search(content):
+        return _iter_lines_re(content)
+    return _iter_lines_lf(content)
+
+
+def _iter_lines_lf(content: str):
+    pos = 0
+    find = content.find
+    while True:
+        end = find('\n', pos)
+        if end == -1:
+            if pos < len(content):
+                yield content[pos:]
+            return
+        yield content[pos:end]
+        pos = end + 1
+
+
+def _iter_lines_re(content: str):
+    pos = 0
+    for m in _LINE_BREAK_RE.finditer(content):
+        yield content[pos:m.start()]
+        pos = m.end()
+    if pos < len(content):
+        yield content[pos:]
+
+
+def _parse_js_ts_regex(content: str, filename: str) -> dict:
+    """Regex-based structural parser for JavaScript and TypeScript files."""
+    imports = []
+    classes = []
+    functions = []
 
     # Walk lines tracking brace depth to know class scope
     class_stack = []   # list of (class_dict, entry_depth)
     seen_funcs = set()
     depth = 0
+    in_template = False  # inside a multi-line `template literal`
+
+    for lineno, raw_line in enumerate(_iter_lines(content), 1):
+        # Imports: ES6 import or CommonJS require
+        if _JS_IMPORT_RE.match(raw_line) or _JS_REQUIRE_RE.match(raw_line):
+            imports.append(raw_line.strip())
 
-    for lineno, raw_line in enumerate(lines, 1):
         stripped = raw_line.strip()
-        open_b = raw_line.count('{') - raw_line.count('`')  # rough; good enough for most files
-        open_b = raw_line.count('{')
-        close_b = raw_line.count('}')
+        open_b, close_b, in_template = _count_code_braces(raw_line, in_template)
 
         # Class declaration
-        class_m = CLASS_RE.match(stripped)
+        class_m = _JS_CLASS_RE.match(stripped)
         if class_m:
             cls = {
                 'name': class_m.group(1),
@@ -236,10 +727,10 @@ def _parse_js_ts(content: str, filename: str) -> dict:
 
         if class_stack:
             # Inside a class — look for methods
-            method_m = METHOD_RE.match(raw_line)
+            method_m = _JS_METHOD_RE.match(raw_line)
             if method_m:
                 name = method_m.group(2)
-                if name not in SKIP_KEYWORDS and not name[0].isupper():
+                if name not in _JS_SKIP_KEYWORDS and not name[0].isupper():
                     # Extract params from the line
                     paren = raw_line.find('(', raw_line.find(name))
                     args = ''
@@ -247,7 +738,7 @@ def _parse_js_ts(content: str, filename: str) -> dict:
                         end = raw_line.find(')', paren)
                         if end != -1:
                             args = raw_line[paren + 1:end].strip()
-                    is_async = bool(re.search(r'\basync\b', raw_line[:raw_line.find(name)]))
+                    is_async = bool(_ASYNC_RE.search(raw_line[:raw_line.find(name)]))
                     class_stack[-1][0]['methods'].append({
                         'name': name,
                         'args': args,
@@ -257,7 +748,7 @@ def _parse_js_ts(content: str, filename: str) -> dict:
                     })
         else:
             # Top-level scope — look for functions
-            func_m = FUNC_RE.match(stripped)
+            func_m = _JS_FUNC_RE.match(stripped)
             if func_m and func_m.group(1) not in seen_funcs:
                 seen_funcs.add(func_m.group(1))
                 is_async = 'async' in stripped[:stripped.index('function')]
@@ -270,12 +761,11 @@ def _parse_js_ts(content: str, filename: str) -> dict:
                 })
                 continue
 
-            arrow_m = ARROW_RE.match(stripped) or CONST_FUNC_RE.match(stripped)
+            arrow_m = _JS_ARROW_RE.match(stripped) or _JS_CONST_FUNC_RE.match(stripped)
             if arrow_m and arrow_m.group(1) not in seen_funcs:
                 name = arrow_m.group(1)
                 seen_funcs.add(name)
-                args_m = re.search(r'\(([^)]*)\)\s*(?:=>|{)', stripped)
-                args = args_m.group(1).strip() if args_m else ''
+                args = _js_arrow_args(stripped)
                 functions.append({
                     'name': name,
                     'args': args,
@@ -316,17 +806,155 @@ _LANG_MAP = {
 }
 
 
-def _extract_args(raw_line: str, name: str) -> str:
-    """Return the argument string from the first '(...)' after `name`."""
-    import re
-    name_pos = raw_line.find(name)
-    if name_pos == -1:
-        return ''
-    paren = raw_line.find('(', name_pos)
-    if paren == -1:
-        return ''
-    end = raw_line.find(')', paren)
-    return raw_line[paren + 1:end].strip() if end != -1 else ''
+# Anchored at the start offset: [^(]* cannot backtrack into a '(', so a
+# failed match costs one pass instead of one pass per '('
+_ARGS_RE = re.compile(r'[^(]*\(([^)]*)\)')
+
+
+def _extract_args(raw_line: str, pos: int) -> str:
+    """Return the argument string from the first '(...)' at or after `pos`."""
+    m = _ARGS_RE.match(raw_line, pos)
+    return m.group(1).strip() if m else ''
+
+
+# ── Generic parser patterns ───────────────────────────────────────────────────
+# Import / using / include detection
+_GEN_IMPORT_RE = re.compile(
+    r'^\s*(?:import|using|#include|require|use\s|from\s|package\s|'
+    r'extern\s+crate|mod\s|include\s|load\s|source\s)\s*\S'
+)
+# A stripped line must start with one of these for _GEN_IMPORT_RE to match
+_GEN_IMPORT_PREFIXES = (
+    'import', 'using', '#include', 'require', 'use', 'from', 'package',
+    'extern', 'mod', 'include', 'load', 'source',
+)
+
+# ── Declaration patterns ──────────────────────────────────────────────────
+# Each language family's line patterns are alternatives of one regex, so a
+# line costs a single match; m.lastgroup names the alternative that hit.
+# Alternatives are tried left to right, which keeps the old precedence.
+
+# Class: class/struct/interface/trait/enum/... Name [any inheritance] [{|EOL]
+_GEN_CLASS_PAT = (
+    r'(?:(?:public|private|protected|internal|abstract|final|sealed|'
+    r'open|data|inner|companion|value|inline|external|expect|actual|'
+    r'static|async|partial|unsafe|new)\s+)*'
+    r'(?:class|struct|interface|trait|enum|record|object|module|'
+    r'namespace|protocol|extension|mixin|singleton)\s+(?P<cls_name>\w+)\b'
+    r'[^{;\n]*'           # extends, implements, :, generics — anything before {
+    r'(?:\{|$)'           # opening brace or end of line (Ruby/Python-like)
+)
+# Keyword-style function: func/fun/fn/def/function/sub/proc/method Name(
+_GEN_FUNC_KW_PAT = (
+    r'(?:(?:public|private|protected|internal|static|final|abstract|'
+    r'async|override|virtual|unsafe|extern|native|inline|const|pure|'
+    r'open|operator|infix|tailrec|suspend|companion|pub|priv)\s+)*'
+    r'(?:func|fun|fn|def|function|sub|proc|method|operator)\s+(?P<kw_name>\w+)\s*[<(]'
+)
+# Java/C# indented method: [modifiers] ReturnType name(params) {
+_JAVA_METH_PAT = (
+    r'(?:\s{2,}|\t+)'
+    r'(?:(?:public|private|protected|static|final|abstract|async|override|'
+    r'virtual|new|sealed|readonly|synchronized|native|volatile)\s+)+'
+    r'(?:[\w<>\[\]?*&]+\s+){1,4}'
+    r'(?P<java_name>\w+)\s*\((?P<java_args>[^)]*)\)(?:\s*throws\s[\w,\s]+\{|\s*\{)'
+)
+# Matched against the raw line; class/keyword forms allow any indentation
+_GEN_DECL_RE = re.compile(
+    rf'(?P<cls>\s*{_GEN_CLASS_PAT})'
+    rf'|(?P<kwfn>\s*{_GEN_FUNC_KW_PAT})'
+    rf'|(?P<javam>{_JAVA_METH_PAT})'
+)
+# Ruby, Go and Rust have no Java-style methods, so they skip that alternative
+_GEN_DECL_NO_JAVA_RE = re.compile(
+    rf'(?P<cls>\s*{_GEN_CLASS_PAT})'
+    rf'|(?P<kwfn>\s*{_GEN_FUNC_KW_PAT})'
+)
+
+# Go, matched against the stripped line:
+#   type Name struct {   /   func (recv Type) Name(   /   func Name(
+_GO_DECL_RE = re.compile(
+    r'(?P<gotype>type\s+(?P<type_name>\w+)\s+(?:struct|interface)\s*\{)'
+    r'|(?P<gorecv>func\s+\(\w+\s+(?P<recv_type>[\w*]+)\)\s+(?P<recv_name>\w+)\s*\((?P<recv_args>[^)]*)\))'
+    r'|(?P<gofn>func\s+(?P<fn_name>\w+)\s*\((?P<fn_args>[^)]*)\))'
+)
+
+# Rust: impl [Trait for] TypeName [<generics>] {
+_RUST_IMPL_RE = re.compile(r'^(?:pub(?:\([^)]*\))?\s+)?impl(?:\s+\S+\s+for)?\s+(\w+)')
+
+# First whitespace-delimited word a line must start with for each
+# _GEN_DECL_RE alternative to be able to match — a set lookup rejects most
+# lines before any regex runs.
+_GEN_CLASS_LEAD = frozenset((
+    'public', 'private', 'protected', 'internal', 'abstract', 'final', 'sealed',
+    'open', 'data', 'inner', 'companion', 'value', 'inline', 'external', 'expect',
+    'actual', 'static', 'async', 'partial', 'unsafe', 'new',
+    'class', 'struct', 'interface', 'trait', 'enum', 'record', 'object', 'module',
+    'namespace', 'protocol', 'extension', 'mixin', 'singleton',
+))
+_GEN_FUNC_LEAD = frozenset((
+    'public', 'private', 'protected', 'internal', 'static', 'final', 'abstract',
+    'async', 'override', 'virtual', 'unsafe', 'extern', 'native', 'inline', 'const',
+    'pure', 'open', 'operator', 'infix', 'tailrec', 'suspend', 'companion', 'pub', 'priv',
+    'func', 'fun', 'fn', 'def', 'function', 'sub', 'proc', 'method',
+))
+_JAVA_METH_LEAD = frozenset((
+    'public', 'private', 'protected', 'static', 'final', 'abstract', 'async',
+    'override', 'virtual', 'new', 'sealed', 'readonly', 'synchronized', 'native',
+    'volatile',
+))
+_GEN_DECL_LEAD = _GEN_CLASS_LEAD | _GEN_FUNC_LEAD | _JAVA_METH_LEAD
+_GEN_DECL_NO_JAVA_LEAD = _GEN_CLASS_LEAD | _GEN_FUNC_LEAD
+
+_GEN_SKIP = frozenset((
+    'if', 'else', 'for', 'while', 'switch', 'match', 'catch', 'try', 'do',
+    'return', 'case', 'default', 'new', 'typeof', 'instanceof', 'throw',
+    'delete', 'void', 'yield', 'await', 'where', 'select', 'from', 'when',
+    'let', 'var', 'const', 'loop', 'unsafe', 'move', 'mut', 'ref', 'in',
+    'with', 'as', 'of', 'by', 'on', 'is', 'not', 'and', 'or',
+    'True', 'False', 'None', 'null', 'nil', 'true', 'false',
+    'main', 'init', 'begin', 'end', 'puts', 'print', 'printf',
+))
+
+# Base-class list after extends / implements / : / < on a class line.
+# Python 3.10 has no possessive quantifiers, so _find_bases() drives the
+# keyword and the list separately to keep long generic lists linear.
+_GEN_BASE_KW_RE = re.compile(r'(?:extends|implements|inherits|<|:(?!:))(\s*)')
+_GEN_BASE_LIST_RE = re.compile(r'([\w, .<>]+?)(?:\s*\{|$|\s+where)')
+_GEN_BASE_RUN_RE = re.compile(r'[\w, .<>]*')
+_GENERICS_RE = re.compile(r'<[^>]*>')
+
+
+_SPACE_RUN_RE = re.compile(r'  +')
+
+
+def _find_bases(line: str) -> list:
+    """Return the base names declared on a class line (generics removed)."""
+    if '  ' in line:
+        # Runs of spaces would make the terminator checks rescan them
+        # from every position of the lazy list match
+        line = _SPACE_RUN_RE.sub(' ', line)
+    run_end = -1
+    for kw in _GEN_BASE_KW_RE.finditer(line):
+        start = kw.end()
+        if start < run_end:
+            # Inside a run of list characters that already failed from an
+            # earlier keyword: it has no terminator, so this start fails too
+            continue
+        m = _GEN_BASE_LIST_RE.match(line, start)
+        if m:
+            raw = m.group(1)
+            cut = raw.rfind('>') + 1  # no '<…>' can extend past the last '>'
+            raw = _GENERICS_RE.sub('', raw[:cut]) + raw[cut:]
+            return [b for b in map(str.strip, raw.split(',')) if b and b not in _GEN_SKIP]
+        # The regex form could also give back whitespace after the keyword
+        # and capture only spaces, which ends the search with no bases
+        ws = kw.group(1)
+        if (' ' in ws and (start == len(line) or line.startswith('{', start))
+                or ' ' in ws[:-1] and line.startswith('where', start)):
+            return []
+        run_end = _GEN_BASE_RUN_RE.match(line, start).end()
+    return []
 
 
 def _parse_generic(content: str, filename: str) -> dict:
@@ -336,72 +964,12 @@ def _parse_generic(content: str, filename: str) -> dict:
     Returns the same dict shape as the Python/JS parsers so format_blueprint()
     and blueprint_file() work identically for every language.
     """
-    import re
-
-    lines = content.splitlines()
     imports = []
     classes = []
     functions = []
 
     suffix = pathlib.Path(filename).suffix.lower()
 
-    # ── Import / using / include detection ────────────────────────────────────
-    IMPORT_RE = re.compile(
-        r'^\s*(?:import|using|#include|require|use\s|from\s|package\s|'
-        r'extern\s+crate|mod\s|include\s|load\s|source\s)\s*\S'
-    )
-    for line in lines:
-        s = line.strip()
-        if IMPORT_RE.match(line) and not s.startswith('//') and not s.startswith('#!'):
-            imports.append(s)
-
-    # ── Class patterns ────────────────────────────────────────────────────────
-    # Main: class/struct/interface/trait/enum/... Name [any inheritance] [{|EOL]
-    CLASS_RE = re.compile(
-        r'^(?:(?:public|private|protected|internal|abstract|final|sealed|'
-        r'open|data|inner|companion|value|inline|external|expect|actual|'
-        r'static|async|partial|unsafe|new)\s+)*'
-        r'(?:class|struct|interface|trait|enum|record|object|module|'
-        r'namespace|protocol|extension|mixin|singleton)\s+(\w+)'
-        r'[^{;\n]*'           # extends, implements, :, generics — anything before {
-        r'\s*(?:\{|$)'        # opening brace or end of line (Ruby/Python-like)
-    )
-    # Go: type Name struct { or type Name interface {
-    GO_TYPE_RE = re.compile(r'^type\s+(\w+)\s+(?:struct|interface)\s*\{')
-    # Rust: impl [Trait for] TypeName [<generics>] {
-    RUST_IMPL_RE = re.compile(r'^(?:pub(?:\([^)]*\))?\s+)?impl(?:\s+\S+\s+for)?\s+(\w+)')
-
-    # ── Function / method patterns ─────────────────────────────────────────────
-    # Keyword-style: func/fun/fn/def/function/sub/proc/method Name(
-    FUNC_KW_RE = re.compile(
-        r'^(?:(?:public|private|protected|internal|static|final|abstract|'
-        r'async|override|virtual|unsafe|extern|native|inline|const|pure|'
-        r'open|operator|infix|tailrec|suspend|companion|pub|priv)\s+)*'
-        r'(?:func|fun|fn|def|function|sub|proc|method|operator)\s+(\w+)\s*[<(]'
-    )
-    # Java/C# indented method: [modifiers] ReturnType name(params) {
-    JAVA_METH_RE = re.compile(
-        r'^(?:\s{2,}|\t+)'
-        r'(?:(?:public|private|protected|static|final|abstract|async|override|'
-        r'virtual|new|sealed|readonly|synchronized|native|volatile)\s+)+'
-        r'(?:[\w<>\[\]?*&]+\s+){1,4}'
-        r'(\w+)\s*\([^)]*\)\s*(?:throws\s+[\w,\s]+)?\s*\{'
-    )
-    # Go receiver method: func (recv Type) Name(
-    GO_RECV_RE = re.compile(r'^func\s+\((\w+)\s+([\w*]+)\)\s+(\w+)\s*\(([^)]*)\)')
-    # Go plain function: func Name(
-    GO_FUNC_RE = re.compile(r'^func\s+(\w+)\s*\(([^)]*)\)')
-
-    SKIP = {
-        'if', 'else', 'for', 'while', 'switch', 'match', 'catch', 'try', 'do',
-        'return', 'case', 'default', 'new', 'typeof', 'instanceof', 'throw',
-        'delete', 'void', 'yield', 'await', 'where', 'select', 'from', 'when',
-        'let', 'var', 'const', 'loop', 'unsafe', 'move', 'mut', 'ref', 'in',
-        'with', 'as', 'of', 'by', 'on', 'is', 'not', 'and', 'or',
-        'True', 'False', 'None', 'null', 'nil', 'true', 'false',
-        'main', 'init', 'begin', 'end', 'do', 'puts', 'print', 'printf',
-    }
-
     # class_stack entries: (class_dict, entry_brace_depth, class_line_indent, brace_mode)
     # brace_mode=True  → scope tracked by {} depth
     # brace_mode=False → scope tracked by `end` keyword at same indentation (Ruby etc.)
@@ -411,47 +979,56 @@ def _parse_generic(content: str, filename: str) -> dict:
     class_by_name: dict = {}
     depth = 0
 
-    is_ruby = suffix == '.rb'
     is_go = suffix == '.go'
     is_rust = suffix == '.rs'
+    if suffix in ('.rb', '.go', '.rs'):
+        decl_match, decl_lead = _GEN_DECL_NO_JAVA_RE.match, _GEN_DECL_NO_JAVA_LEAD
+    else:
+        decl_match, decl_lead = _GEN_DECL_RE.match, _GEN_DECL_LEAD
 
-    for lineno, raw_line in enumerate(lines, 1):
+    for lineno, raw_line in enumerate(_iter_lines(content), 1):
         stripped = raw_line.strip()
-        line_indent = len(raw_line) - len(raw_line.lstrip())
-
         if not stripped:
-            depth += raw_line.count('{') - raw_line.count('}')
-            continue
+            continue  # whitespace-only: no braces or imports
+
+        # ── Import / using / include detection ────────────────────────────────
+        if stripped.startswith(_GEN_IMPORT_PREFIXES) and _GEN_IMPORT_RE.match(raw_line):
+            imports.append(stripped)
 
-        open_b = raw_line.count('{')
-        close_b = raw_line.count('}')
+        # Indentation (raw_line.find(stripped[0])) is only needed on the rare
+        # lines that open or close a class, so it is computed there
+        first = stripped.split(None, 1)[0]
+        # `in` tests are cheaper than calls, and most lines have no braces
+        has_open = '{' in raw_line
+        delta = (raw_line.count('{') - raw_line.count('}')
+                 if has_open or '}' in raw_line else 0)
 
         # ── Ruby `end` closes the current class scope ──────────────────────────
         if class_stack and not class_stack[-1][3]:  # non-brace mode
-            if stripped == 'end' and line_indent <= class_stack[-1][2]:
+            if stripped == 'end' and raw_line.find('e') <= class_stack[-1][2]:
                 class_stack.pop()
-                depth += open_b - close_b
+                depth += delta
                 continue
 
         # ── Go: type Name struct / interface ──────────────────────────────────
-        if is_go:
-            go_type_m = GO_TYPE_RE.match(stripped)
-            if go_type_m:
-                name = go_type_m.group(1)
+        go_m = _GO_DECL_RE.match(stripped) if is_go and first in ('type', 'func') else None
+        if go_m:
+            kind = go_m.lastgroup
+            if kind == 'gotype':
+                name = go_m.group('type_name')
                 cls = {'name': name, 'bases': [], 'lineno': lineno, 'methods': []}
                 classes.append(cls)
                 class_by_name[name] = cls
-                class_stack.append((cls, depth, line_indent, True))
-                depth += open_b - close_b
+                class_stack.append((cls, depth, raw_line.find(stripped[0]), True))
+                depth += delta
                 continue
 
             # Go receiver method → attach to struct
-            recv_m = GO_RECV_RE.match(stripped)
-            if recv_m:
-                type_name = recv_m.group(2).lstrip('*')
-                name = recv_m.group(3)
-                args = recv_m.group(4).strip()
-                if name not in SKIP:
+            if kind == 'gorecv':
+                type_name = go_m.group('recv_type').lstrip('*')
+                name = go_m.group('recv_name')
+                args = go_m.group('recv_args').strip()
+                if name not in _GEN_SKIP:
                     if type_name in class_by_name:
                         class_by_name[type_name]['methods'].append({
                             'name': name, 'args': args, 'returns': '',
@@ -466,60 +1043,50 @@ def _parse_generic(content: str, filename: str) -> dict:
                             'name': name, 'args': args, 'returns': '',
                             'lineno': lineno, 'is_async': False,
                         })
-                depth += open_b - close_b
+                depth += delta
                 continue
 
             # Go plain function
-            go_fn_m = GO_FUNC_RE.match(stripped)
-            if go_fn_m:
-                name = go_fn_m.group(1)
-                if name not in SKIP and name not in seen_funcs:
-                    seen_funcs.add(name)
-                    functions.append({
-                        'name': name, 'args': go_fn_m.group(2).strip(), 'returns': '',
-                        'lineno': lineno, 'is_async': False,
-                    })
-                depth += open_b - close_b
-                continue
+            name = go_m.group('fn_name')
+            if name not in _GEN_SKIP and name not in seen_funcs:
+                seen_funcs.add(name)
+                functions.append({
+                    'name': name, 'args': go_m.group('fn_args').strip(), 'returns': '',
+                    'lineno': lineno, 'is_async': False,
+                })
+            depth += delta
+            continue
 
         # ── Rust impl block → merge methods into existing struct ───────────────
         if is_rust and stripped.startswith('impl'):
-            impl_m = RUST_IMPL_RE.match(stripped)
+            impl_m = _RUST_IMPL_RE.match(stripped)
             if impl_m:
                 type_name = impl_m.group(1)
-                if type_name not in SKIP:
+                if type_name not in _GEN_SKIP:
                     if type_name in class_by_name:
                         target = class_by_name[type_name]
                     else:
                         target = {'name': type_name, 'bases': [], 'lineno': lineno, 'methods': []}
                         classes.append(target)
                         class_by_name[type_name] = target
-                    class_stack.append((target, depth, line_indent, True))
-                    depth += open_b - close_b
+                    class_stack.append((target, depth, raw_line.find(stripped[0]), True))
+                    depth += delta
                     continue
 
         # ── Class / struct / … declaration ────────────────────────────────────
-        class_m = CLASS_RE.match(stripped)
-        if class_m:
-            name = class_m.group(1)
-            if name not in SKIP:
-                bases = []
-                base_m = re.search(
-                    r'(?:extends|implements|inherits|<|:(?!:))\s*([\w, .<>]+?)(?:\s*\{|$|\s+where)',
-                    stripped
-                )
-                if base_m:
-                    raw_bases = re.sub(r'<[^>]*>', '', base_m.group(1))
-                    bases = [b.strip() for b in raw_bases.split(',') if b.strip() and b.strip() not in SKIP]
-                uses_brace = open_b > 0
-                cls = {'name': name, 'bases': bases, 'lineno': lineno, 'methods': []}
+        decl_m = decl_match(raw_line) if first in decl_lead else None
+        decl = decl_m.lastgroup if decl_m else None
+        if decl == 'cls':
+            name = decl_m.group('cls_name')
+            if name not in _GEN_SKIP:
+                cls = {'name': name, 'bases': _find_bases(stripped), 'lineno': lineno, 'methods': []}
                 classes.append(cls)
                 class_by_name[name] = cls
-                class_stack.append((cls, depth, line_indent, uses_brace))
-                depth += open_b - close_b
+                class_stack.append((cls, depth, raw_line.find(stripped[0]), has_open))
+                depth += delta
                 continue
 
-        depth += open_b - close_b
+        depth += delta
 
         # ── Pop brace-tracked classes whose scope closed ───────────────────────
         while class_stack and class_stack[-1][3] and depth <= class_stack[-1][1]:
@@ -527,12 +1094,12 @@ def _parse_generic(content: str, filename: str) -> dict:
 
         # ── Method or top-level function ───────────────────────────────────────
         # Keyword-style (def, fn, func, fun, function, …)
-        kw_m = FUNC_KW_RE.match(stripped)
-        if kw_m:
-            name = kw_m.group(1)
-            if name not in SKIP:
-                args = _extract_args(raw_line, name)
-                is_async = bool(re.search(r'\basync\b', raw_line[:raw_line.find(name)]))
+        if decl == 'kwfn':
+            name = decl_m.group('kw_name')
+            if name not in _GEN_SKIP:
+                name_pos = decl_m.start('kw_name')
+                args = _extract_args(raw_line, name_pos)
+                is_async = bool(_ASYNC_RE.search(raw_line, 0, name_pos))
                 entry = {'name': name, 'args': args, 'returns': '', 'lineno': lineno, 'is_async': is_async}
                 if class_stack:
                     class_stack[-1][0]['methods'].append(entry)
@@ -542,19 +1109,17 @@ def _parse_generic(content: str, filename: str) -> dict:
             continue
 
         # Java/C# indented method with return type
-        if not is_ruby and not is_go and not is_rust:
-            jm = JAVA_METH_RE.match(raw_line)
-            if jm:
-                name = jm.group(1)
-                if name not in SKIP:
-                    args = _extract_args(raw_line, name)
-                    is_async = 'async' in raw_line[:raw_line.find(name)]
-                    entry = {'name': name, 'args': args, 'returns': '', 'lineno': lineno, 'is_async': is_async}
-                    if class_stack:
-                        class_stack[-1][0]['methods'].append(entry)
-                    elif name not in seen_funcs:
-                        seen_funcs.add(name)
-                        functions.append(entry)
+        if decl == 'javam':
+            name = decl_m.group('java_name')
+            if name not in _GEN_SKIP:
+                args = decl_m.group('java_args').strip()
+                is_async = 'async' in raw_line[:decl_m.start('java_name')]
+                entry = {'name': name, 'args': args, 'returns': '', 'lineno': lineno, 'is_async': is_async}
+                if class_stack:
+                    class_stack[-1][0]['methods'].append(entry)
+                elif name not in seen_funcs:
+                    seen_funcs.add(name)
+                    functions.append(entry)
 
     lang = _LANG_MAP.get(suffix, suffix.lstrip('.').upper() or 'Unknown')
     return {
@@ -567,12 +1132,71 @@ def _parse_generic(content: str, filename: str) -> dict:
     }
 
 
+# (blake2b(content), suffix) -> packed parse result, least recently used first
+_PARSE_CACHE: OrderedDict = OrderedDict()
+_PARSE_CACHE_SIZE = 512
+_PARSE_CACHE_LOCK = threading.Lock()
+
+
+def _pack_structure(result: dict) -> tuple:
+    """Flatten a parse_structure() dict into nested tuples.
+
+    The packed form is what the parse cache holds and what worker processes
+    send back: tuples are far smaller than the equivalent dicts and lists,
+    and rebuilding fresh dicts from them is cheaper than a deepcopy.
+    """
+    def fn(f):
+        return (f['name'], f['args'], f['returns'], f['lineno'], f['is_async'])
+
+    header = tuple((k, v) for k, v in result.items()
+                   if k not in ('imports', 'classes', 'functions'))
+    classes = tuple(
+        (c['name'], tuple(c['bases']), c['lineno'], tuple(fn(m) for m in c['methods']))
+        for c in result['classes']
+    )
+    return (header, tuple(result['imports']), classes,
+            tuple(fn(f) for f in result['functions']))
+
+
+def _unpack_structure(packed: tuple) -> dict:
+    """Rebuild the parse_structure() dict from _pack_structure() output."""
+    header, imports, classes, functions = packed
+    result = dict(header)
+    result['imports'] = list(imports)
+    result['classes'] = [
+        {'name': name, 'bases': list(bases), 'lineno': lineno, 'methods': [
+            {'name': n, 'args': a, 'returns': r, 'lineno': ln, 'is_async': ia}
+            for n, a, r, ln, ia in methods
+        ]}
+        for name, bases, lineno, methods in classes
+    ]
+    result['functions'] = [
+        {'name': n, 'args': a, 'returns': r, 'lineno': ln, 'is_async': ia}
+        for n, a, r, ln, ia in functions
+    ]
+    return result
+
+
+def _parse_cache_key(content: str, filename: str) -> tuple:
+    digest = hashlib.blake2b(
+        content.encode('utf-8', errors='surrogatepass'), digest_size=16
+    ).digest()
+    return digest, pathlib.Path(filename).suffix.lower()
+
+
+def _parse_cache_put(key: tuple, packed: tuple) -> None:
+    with _PARSE_CACHE_LOCK:
+        _PARSE_CACHE[key] = packed
+        while len(_PARSE_CACHE) > _PARSE_CACHE_SIZE:
+            _PARSE_CACHE.popitem(last=False)
+
+
 def parse_structure(content: str, filename: str) -> dict:
     """Parse a file's structure and return a normalised dict.
 
-    Dispatches to:
+    Dispatches through _PARSERS to:
       .py               → Python AST (precise)
-      .js .jsx .ts .tsx → dedicated JS/TS regex parser
+      .js .jsx .ts .tsx → dedicated JS/TS parser (tree-sitter or regex)
       everything else   → universal _parse_generic() regex parser
 
     Returns:
@@ -582,15 +1206,172 @@ def parse_structure(content: str, filename: str) -> dict:
       imports    – list[str]
       classes    – list[{name, bases, lineno, methods}]
       functions  – list[{name, args, returns, lineno, is_async}]
+
+    Results are memoized on (content hash, suffix) for the last
+    _PARSE_CACHE_SIZE distinct inputs; callers get their own fresh copy.
+    parse_structure.cache_clear() empties the cache.
     """
-    suffix = pathlib.Path(filename).suffix.lower()
+    key = _parse_cache_key(content, filename)
+    with _PARSE_CACHE_LOCK:
+        packed = _PARSE_CACHE.get(key)
+        if packed is not None:
+            _PARSE_CACHE.move_to_end(key)
+    if packed is None:
+        packed = _pack_structure(_parse_structure_uncached(content, filename))
+        _parse_cache_put(key, packed)
+    return _unpack_structure(packed)
+
+
+parse_structure.cache_clear = _PARSE_CACHE.clear
+
+
+def _parse_structure_packed(content: str, filename: str) -> tuple:
+    """Process-pool worker: parse and return the packed form."""
+    return _pack_structure(_parse_structure_uncached(content, filename))
+
+
+# Below these sizes a process pool costs more to start than it saves
+_PARALLEL_MIN_FILES = 8
+_PARALLEL_MIN_BYTES = 256 * 1024
+
+
+def parse_structure_many(files: list) -> list:
+    """parse_structure() over a list of (content, filename) pairs, in input order.
+
+    Cached files are served from the parse cache; large batches of the
+    remaining misses are spread over a process pool (ast.parse holds the
+    GIL, so threads would not help), small ones are parsed inline. Pool
+    results are added to the parse cache like inline ones.
+    """
+    files = list(files)
+    keys = [_parse_cache_key(content, name) for content, name in files]
+    packed = [None] * len(files)
+    with _PARSE_CACHE_LOCK:
+        for i, key in enumerate(keys):
+            hit = _PARSE_CACHE.get(key)
+            if hit is not None:
+                _PARSE_CACHE.move_to_end(key)
+                packed[i] = hit
+    misses = [i for i, p in enumerate(packed) if p is None]
+
+    workers = min(len(misses), os.cpu_count() or 1)
+    pooled = None
+    if (len(misses) >= _PARALLEL_MIN_FILES and workers >= 2
+            and sum(len(files[i][0]) for i in misses) >= _PARALLEL_MIN_BYTES):
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as ex:
+                pooled = list(ex.map(
+                    _parse_structure_packed,
+                    [files[i][0] for i in misses], [files[i][1] for i in misses],
+                    chunksize=max(1, len(misses) // (workers * 4)),
+                ))
+        except (OSError, BrokenProcessPool):
+            # No usable worker processes (sandboxes, frozen builds) — parse inline
+            pooled = None
+    if pooled is None:
+        pooled = [_parse_structure_packed(*files[i]) for i in misses]
 
-    if suffix in ('.js', '.jsx', '.ts', '.tsx'):
-        return _parse_js_ts(content, filename)
+    for i, p in zip(misses, pooled):
+        _parse_cache_put(keys[i], p)
+        packed[i] = p
+    return [_unpack_structure(p) for p in packed]
 
-    if suffix != '.py':
-        return _parse_generic(content, filename)
 
+# Compound statements searched for module-level conditional imports
+_IMPORT_BLOCKS = (ast.If, ast.Try, ast.With) + ((ast.TryStar,) if hasattr(ast, 'TryStar') else ())
+
+
+# Python sources above this many characters skip ast.parse (generated
+# protobuf / ORM modules can take seconds) and use _parse_python_lines()
+try:
+    _MAX_AST_CHARS = int(os.environ.get('CODESENSEI_MAX_AST_CHARS', 1_000_000))
+except ValueError:
+    _MAX_AST_CHARS = 1_000_000
+
+_PY_CLASS_RE = re.compile(r'class\s+(\w+)\s*(?:\(([^)]*)(\))?)?')
+_PY_DEF_RE = re.compile(r'(async\s+)?def\s+(\w+)\s*\(([^)]*)\)?(?:\s*->\s*([^:]+))?')
+_PY_IMPORT_RE = re.compile(r'(?:from\s+\.*([\w.]*)\s+import\b|import\s+([\w.]+(?:\s*,\s*[\w.]+)*))')
+
+
+def _parse_python_lines(content: str, filename: str) -> dict:
+    """Indentation-based fallback for Python files too large for ast.parse.
+
+    Same dict shape as the AST parser. Signatures spanning several lines
+    keep only their first line's arguments.
+    """
+    imports = []
+    classes = []
+    functions = []
+    cls = None            # top-level class whose body we are in
+    body_indent = None    # indentation of that class's direct members
+    in_def = False        # inside a top-level function body
+    in_header = False     # inside a class header's unclosed '(' bases list
+
+    for lineno, line in enumerate(_iter_lines(content), 1):
+        stripped = line.lstrip()
+        if not stripped or stripped[0] == '#':
+            continue
+        if in_header:
+            in_header = ')' not in stripped
+            continue
+        indent = len(line) - len(stripped)
+        if indent == 0:
+            cls = None
+            in_def = False
+        elif cls is not None and body_indent is None:
+            body_indent = indent
+
+        if not in_def and (cls is None or indent < body_indent):
+            # Module level, including if/try/with blocks
+            m = _PY_IMPORT_RE.match(stripped)
+            if m:
+                if m.group(2) is not None:
+                    imports.extend(name.strip() for name in m.group(2).split(','))
+                else:
+                    imports.append(m.group(1))
+                continue
+        if indent and (cls is None or indent != body_indent):
+            continue
+
+        m = _PY_DEF_RE.match(stripped)
+        if m:
+            entry = {
+                'name': m.group(2),
+                'args': ' '.join(m.group(3).split()),
+                'returns': f" -> {m.group(4).strip()}" if m.group(4) else '',
+                'lineno': lineno,
+                'is_async': bool(m.group(1)),
+            }
+            if indent:
+                cls['methods'].append(entry)
+            else:
+                functions.append(entry)
+                in_def = True
+            continue
+        if indent == 0:
+            m = _PY_CLASS_RE.match(stripped)
+            if m:
+                bases = [b.strip() for b in (m.group(2) or '').split(',')
+                         if b.strip() and '=' not in b]  # not metaclass=...
+                cls = {'name': m.group(1), 'bases': bases, 'lineno': lineno, 'methods': []}
+                body_indent = None
+                in_header = m.group(2) is not None and m.group(3) is None
+                classes.append(cls)
+
+    return {
+        'supported': True,
+        'language': 'Python',
+        'error': None,
+        'imports': list(dict.fromkeys(imports)),  # deduplicate, preserve order
+        'classes': classes,
+        'functions': functions,
+    }
+
+
+def _parse_python(content: str, filename: str) -> dict:
+    """AST-based structural parser for Python files."""
+    if len(content) > _MAX_AST_CHARS:
+        return _parse_python_lines(content, filename)
     try:
         tree = ast.parse(content)
     except SyntaxError as e:
@@ -622,15 +1403,24 @@ def parse_structure(content: str, filename: str) -> dict:
             return f" -> {ast.unparse(node.returns)}"
         return ''
 
-    for node in ast.walk(tree):
-        if isinstance(node, (ast.Import, ast.ImportFrom)):
-            if isinstance(node, ast.Import):
-                for alias in node.names:
-                    imports.append(alias.name)
-            else:
-                mod = node.module or ''
-                imports.append(mod)
-
+    def _collect_imports(node) -> None:
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                imports.append(alias.name)
+        elif isinstance(node, ast.ImportFrom):
+            imports.append(node.module or '')
+        elif isinstance(node, _IMPORT_BLOCKS):
+            # module-level ``if TYPE_CHECKING:`` / ``try: import x`` blocks
+            for block in (getattr(node, 'body', []), getattr(node, 'orelse', []),
+                          getattr(node, 'finalbody', [])):
+                for child in block:
+                    _collect_imports(child)
+            for handler in getattr(node, 'handlers', []):
+                for child in handler.body:
+                    _collect_imports(child)
+
+    # One pass over the module body; function and class bodies are not
+    # searched for imports.
     for node in tree.body:
         if isinstance(node, ast.ClassDef):
             bases = [ast.unparse(b) for b in node.bases] if node.bases else []
@@ -658,6 +1448,8 @@ def parse_structure(content: str, filename: str) -> dict:
                 'lineno': node.lineno,
                 'is_async': isinstance(node, ast.AsyncFunctionDef),
             })
+        else:
+            _collect_imports(node)
 
     return {
         'supported': True,
@@ -669,14 +1461,29 @@ def parse_structure(content: str, filename: str) -> dict:
     }
 
 
-_PROJECT_IGNORE = {
+# Suffix -> specialised parser; anything else goes to _parse_generic()
+_PARSERS = {
+    '.py': _parse_python,
+    '.js': _parse_js_ts, '.jsx': _parse_js_ts, '.ts': _parse_js_ts, '.tsx': _parse_js_ts,
+}
+
+
+def _parse_structure_uncached(content: str, filename: str) -> dict:
+    """parse_structure() without the result cache."""
+    suffix = pathlib.Path(filename).suffix.lower()
+    return _PARSERS.get(suffix, _parse_generic)(content, filename)
+
+
+# Directory (or file) names skipped anywhere in the tree; _walk_project tests
+# each entry name against this once, before descending
+_PROJECT_IGNORE = frozenset({
     '.venv', 'venv', '__pycache__', '.git', 'node_modules',
     'env', '.env', 'dist', 'build', '.pytest_cache', 'coverage',
     'htmlcov', '.mypy_cache', '.tox', 'site-packages', '.idea', '.vscode',
-}
+})
 
 
-_BINARY_EXTENSIONS = {
+_BINARY_EXTENSIONS = frozenset({
     '.png', '.jpg', '.jpeg', '.gif', '.bmp', '.ico',
     '.pdf', '.zip', '.tar', '.gz', '.rar', '.7z',
     '.exe', '.dll', '.so', '.dylib', '.bin',
@@ -684,116 +1491,314 @@ _BINARY_EXTENSIONS = {
     '.pyc', '.pyd', '.whl', '.class', '.jar',
     '.ttf', '.otf', '.woff', '.woff2', '.eot',
     '.db', '.sqlite', '.sqlite3', '.lock',
-}
+})
 
-_JS_TS_EXTS = {'.js', '.jsx', '.ts', '.tsx'}
+_JS_TS_EXTS = frozenset({'.js', '.jsx', '.ts', '.tsx'})
 
 # Extensions handled by _parse_file_summary (markup/data/config — no classes/functions)
-_SUMMARY_EXTS = {
+_SUMMARY_EXTS = frozenset({
     '.html', '.htm', '.css', '.scss', '.sass',
     '.json', '.csv', '.yaml', '.yml', '.md', '.markdown',
     '.toml', '.xml', '.env', '.iml', '.graphql', '.gql', '.proto',
+})
+
+_CODE_EXTS = (frozenset({'.py'}) | _JS_TS_EXTS | frozenset(_LANG_MAP)) - _SUMMARY_EXTS
+
+# Summaries only look at the head of a data file (JSON parsing is capped well
+# below this), so parse_project never decodes more than this many characters
+# of a non-code file
+_SUMMARY_MAX_CHARS = 2_000_000
+
+# How parse_project treats a file, by lower-cased suffix (see _classify_ext)
+_EXT_TEXT = 0     # summarised by _parse_file_summary (the default)
+_EXT_CODE = 1     # parsed by parse_structure
+_EXT_BINARY = 2   # skipped entirely
+_EXT_CATEGORY = {
+    **{ext: _EXT_CODE for ext in _CODE_EXTS},
+    **{ext: _EXT_BINARY for ext in _BINARY_EXTENSIONS},
 }
 
-_CODE_EXTS = ({'.py'} | _JS_TS_EXTS | set(_LANG_MAP.keys())) - _SUMMARY_EXTS
+
+def _name_suffix(name: str) -> str:
+    """Lower-cased suffix of a bare file name, by pathlib's rules, without a Path."""
+    dot = name.rfind('.')
+    if 0 < dot < len(name) - 1:
+        return name[dot:].lower()
+    return ''
+
+
+def _classify_ext(name: str) -> int:
+    """Return the _EXT_* category of a file name, using pathlib's suffix rules."""
+    return _EXT_CATEGORY.get(_name_suffix(name), _EXT_TEXT)
+
+
+# Patterns used by _parse_file_summary, compiled once rather than per file
+_HTML_TITLE_RE = re.compile(r'<title[^>]*>(.*?)</title>', re.IGNORECASE | re.DOTALL)
+_HTML_SCRIPT_RE = re.compile(r'<script[^>]+src=["\']([^"\']+)["\']', re.IGNORECASE)
+_HTML_STYLE_RE = re.compile(r'<link[^>]+href=["\']([^"\']+\.css)["\']', re.IGNORECASE)
+_HTML_ID_RE = re.compile(r'\bid=["\']([^"\']+)["\']')
+_HTML_TAG_RE = re.compile(r'<(\w+)')
+_CSS_SELECTOR_RE = re.compile(r'([.#][\w\-]+)\s*(?:,|\{)')
+_CSS_MEDIA_RE = re.compile(r'@media\s+([^{]+)\{')
+# Line-start patterns are anchored on a literal '\n' and searched over
+# '\n' + content: the engine can then jump from newline to newline instead of
+# testing '^' at every position. No match ends on a newline, so a match never
+# swallows the one that starts the next match.
+_CSS_ELEMENT_RE = re.compile(r'\n([a-z][\w\-]*)[\s,]*\{')
+_YAML_KEY_RE = re.compile(r'\n(\w[\w\-]*):')
+_MD_HEADING_RE = re.compile(r'\n#{1,3}\s+(.+)')
+_ENV_KEY_RE = re.compile(r'\n([A-Z_][A-Z0-9_]*)=')
+# A whitespace-only line between two newlines; the lookahead leaves the
+# closing newline in place so consecutive blank lines are all counted.
+_BLANK_LINE_RE = re.compile(r'\n[^\S\n]*(?=\n)')
+
+
+def _unique_first(items, limit: int) -> list:
+    """Return the first `limit` distinct items, in order, without deduping the rest."""
+    seen = set()
+    out = []
+    for item in items:
+        if item not in seen:
+            seen.add(item)
+            out.append(item)
+            if len(out) == limit:
+                break
+    return out
+
+
+def _csv_summary(first_line: str, row_count: int) -> list:
+    """Summary lines for a CSV file from its stripped header and data row count."""
+    items = []
+    if first_line:
+        cols = [c.strip().strip('"') for c in first_line.split(',')]
+        items.append(f"Columns ({len(cols)}): {', '.join(cols[:10])}" + (' ...' if len(cols) > 10 else ''))
+    if row_count > 0:
+        items.append(f"Rows: {row_count}")
+    return items
 
 
-def _parse_file_summary(content: str, filename: str) -> list:
-    """Return a list of human-readable summary strings for non-code files."""
-    import re, json as _json
-    ext = pathlib.Path(filename).suffix.lower()
+def _summary_json(content: str) -> list:
     items = []
+    try:
+        data = json.loads(content[:200_000])  # cap at 200KB to avoid huge files
+        if isinstance(data, dict):
+            keys = list(data.keys())
+            if 'name' in data and 'version' in data:
+                items.append(f"Package: {data.get('name')}  v{data.get('version')}")
+            if 'scripts' in data and isinstance(data['scripts'], dict):
+                items.append(f"Scripts: {', '.join(data['scripts'].keys())}")
+            if 'dependencies' in data and isinstance(data['dependencies'], dict):
+                deps = list(data['dependencies'].keys())
+                items.append(f"Dependencies ({len(deps)}): {', '.join(deps[:8])}" + (' ...' if len(deps) > 8 else ''))
+            if 'devDependencies' in data and isinstance(data['devDependencies'], dict):
+                devdeps = list(data['devDependencies'].keys())
+                items.append(f"DevDependencies ({len(devdeps)}): {', '.join(devdeps[:6])}" + (' ...' if len(devdeps) > 6 else ''))
+            if not items:
+                items.append(f"Keys: {', '.join(keys[:12])}" + (' ...' if len(keys) > 12 else ''))
+        elif isinstance(data, list):
+            items.append(f"Array: {len(data)} item(s)")
+            if data and isinstance(data[0], dict):
+                fields = list(data[0].keys())
+                items.append(f"Fields: {', '.join(fields[:10])}" + (' ...' if len(fields) > 10 else ''))
+    except Exception:
+        pass  # skip unparseable JSON silently
+    return items
 
-    if ext in ('.json',):
-        try:
-            data = _json.loads(content[:200_000])  # cap at 200KB to avoid huge files
-            if isinstance(data, dict):
-                keys = list(data.keys())
-                if 'name' in data and 'version' in data:
-                    items.append(f"Package: {data.get('name')}  v{data.get('version')}")
-                if 'scripts' in data and isinstance(data['scripts'], dict):
-                    items.append(f"Scripts: {', '.join(data['scripts'].keys())}")
-                if 'dependencies' in data and isinstance(data['dependencies'], dict):
-                    deps = list(data['dependencies'].keys())
-                    items.append(f"Dependencies ({len(deps)}): {', '.join(deps[:8])}" + (' ...' if len(deps) > 8 else ''))
-                if 'devDependencies' in data and isinstance(data['devDependencies'], dict):
-                    devdeps = list(data['devDependencies'].keys())
-                    items.append(f"DevDependencies ({len(devdeps)}): {', '.join(devdeps[:6])}" + (' ...' if len(devdeps) > 6 else ''))
-                if not items:
-                    items.append(f"Keys: {', '.join(keys[:12])}" + (' ...' if len(keys) > 12 else ''))
-            elif isinstance(data, list):
-                items.append(f"Array: {len(data)} item(s)")
-                if data and isinstance(data[0], dict):
-                    fields = list(data[0].keys())
-                    items.append(f"Fields: {', '.join(fields[:10])}" + (' ...' if len(fields) > 10 else ''))
-        except Exception:
-            pass  # skip unparseable JSON silently
-
-    elif ext in ('.html', '.htm'):
-        title = re.search(r'<title[^>]*>(.*?)</title>', content, re.IGNORECASE | re.DOTALL)
-        if title:
-            items.append(f"Title: {title.group(1).strip()}")
-        scripts = re.findall(r'<script[^>]+src=["\']([^"\']+)["\']', content, re.IGNORECASE)
-        if scripts:
-            items.append(f"Scripts: {', '.join(scripts)}")
-        links = re.findall(r'<link[^>]+href=["\']([^"\']+\.css)["\']', content, re.IGNORECASE)
-        if links:
-            items.append(f"Styles: {', '.join(links)}")
-        ids = re.findall(r'\bid=["\']([^"\']+)["\']', content)
-        if ids:
-            items.append(f"IDs ({len(ids)}): {', '.join(ids[:8])}" + (' ...' if len(ids) > 8 else ''))
-        if not items:
-            # Fallback: count tags
-            tags = re.findall(r'<(\w+)', content)
-            unique = list(dict.fromkeys(tags))[:10]
-            if unique:
-                items.append(f"Elements: {', '.join(unique)}")
-
-    elif ext in ('.css', '.scss', '.sass'):
-        # Class and ID selectors
-        selectors = re.findall(r'([.#][\w\-]+)\s*(?:,|\{)', content)
-        unique_sel = list(dict.fromkeys(selectors))
-        if unique_sel:
-            items.append(f"Selectors ({len(unique_sel)}): {', '.join(unique_sel[:12])}" + (' ...' if len(unique_sel) > 12 else ''))
-        # Element selectors (body, div, h1 etc.)
-        el_sel = re.findall(r'^([a-z][\w\-]*)[\s,]*\{', content, re.MULTILINE)
-        if el_sel:
-            unique_el = list(dict.fromkeys(el_sel))
-            items.append(f"Elements: {', '.join(unique_el[:10])}")
-        media = re.findall(r'@media\s+([^{]+)\{', content)
-        if media:
-            items.append(f"Media queries: {len(media)}")
-        if not items:
-            rule_count = len(re.findall(r'\{', content))
-            items.append(f"Rules: {rule_count}")
-
-    elif ext == '.csv':
-        first_line = content.split('\n')[0].strip()
-        if first_line:
-            cols = [c.strip().strip('"') for c in first_line.split(',')]
-            items.append(f"Columns ({len(cols)}): {', '.join(cols[:10])}" + (' ...' if len(cols) > 10 else ''))
-        row_count = max(0, len([l for l in content.split('\n') if l.strip()]) - 1)
-        if row_count > 0:
-            items.append(f"Rows: {row_count}")
-
-    elif ext in ('.yaml', '.yml'):
-        top_keys = re.findall(r'^(\w[\w\-]*):', content, re.MULTILINE)
-        if top_keys:
-            items.append(f"Keys: {', '.join(dict.fromkeys(top_keys))}")
-
-    elif ext == '.md':
-        headings = re.findall(r'^#{1,3}\s+(.+)', content, re.MULTILINE)
-        if headings:
-            items.append(f"Sections: {', '.join(headings[:6])}" + (' ...' if len(headings) > 6 else ''))
-
-    elif ext in ('.env',):
-        keys = re.findall(r'^([A-Z_][A-Z0-9_]*)=', content, re.MULTILINE)
-        if keys:
-            items.append(f"Variables: {', '.join(keys)}")
 
+def _summary_html(content: str) -> list:
+    items = []
+    title = _HTML_TITLE_RE.search(content)
+    if title:
+        items.append(f"Title: {title.group(1).strip()}")
+    scripts = _HTML_SCRIPT_RE.findall(content)
+    if scripts:
+        items.append(f"Scripts: {', '.join(scripts)}")
+    links = _HTML_STYLE_RE.findall(content)
+    if links:
+        items.append(f"Styles: {', '.join(links)}")
+    ids = _HTML_ID_RE.findall(content)
+    if ids:
+        items.append(f"IDs ({len(ids)}): {', '.join(ids[:8])}" + (' ...' if len(ids) > 8 else ''))
+    if not items:
+        # Fallback: count tags
+        tags = _HTML_TAG_RE.findall(content)
+        unique = _unique_first(tags, 10)
+        if unique:
+            items.append(f"Elements: {', '.join(unique)}")
     return items
 
 
+def _summary_css(content: str) -> list:
+    items = []
+    # Class and ID selectors
+    selectors = _CSS_SELECTOR_RE.findall(content)
+    unique_sel = list(dict.fromkeys(selectors))
+    if unique_sel:
+        items.append(f"Selectors ({len(unique_sel)}): {', '.join(unique_sel[:12])}" + (' ...' if len(unique_sel) > 12 else ''))
+    # Element selectors (body, div, h1 etc.)
+    el_sel = _CSS_ELEMENT_RE.findall('\n' + content)
+    if el_sel:
+        unique_el = _unique_first(el_sel, 10)
+        items.append(f"Elements: {', '.join(unique_el)}")
+    media = _CSS_MEDIA_RE.findall(content)
+    if media:
+        items.append(f"Media queries: {len(media)}")
+    if not items:
+        rule_count = content.count('{')
+        items.append(f"Rules: {rule_count}")
+    return items
+
+
+def _summary_csv(content: str) -> list:
+    first_line = content.partition('\n')[0].strip()
+    # Non-blank lines, counted without splitting the file into row strings:
+    # every line minus the blank ones (the regex only sees interior lines)
+    newlines = content.count('\n')
+    lines = newlines + 1 - len(_BLANK_LINE_RE.findall(content))
+    if not first_line:
+        lines -= 1
+    if newlines and not content.rpartition('\n')[2].strip():
+        lines -= 1
+    return _csv_summary(first_line, max(0, lines - 1))
+
+
+# Key lists (YAML top-level keys, .env variables) show at most this many
+# distinct names; one more is collected to know whether to add ' ...'
+_SUMMARY_MAX_KEYS = 64
+
+
+def _summary_yaml(content: str) -> list:
+    top_keys = _unique_first(_YAML_KEY_RE.findall('\n' + content), _SUMMARY_MAX_KEYS + 1)
+    if top_keys:
+        more = len(top_keys) > _SUMMARY_MAX_KEYS
+        return [f"Keys: {', '.join(top_keys[:_SUMMARY_MAX_KEYS])}" + (' ...' if more else '')]
+    return []
+
+
+def _summary_md(content: str) -> list:
+    headings = _MD_HEADING_RE.findall('\n' + content)
+    if headings:
+        return [f"Sections: {', '.join(headings[:6])}" + (' ...' if len(headings) > 6 else '')]
+    return []
+
+
+def _summary_env(content: str) -> list:
+    keys = _unique_first(_ENV_KEY_RE.findall('\n' + content), _SUMMARY_MAX_KEYS + 1)
+    if keys:
+        more = len(keys) > _SUMMARY_MAX_KEYS
+        return [f"Variables: {', '.join(keys[:_SUMMARY_MAX_KEYS])}" + (' ...' if more else '')]
+    return []
+
+
+# Lower-cased suffix -> summary handler; anything else gets no summary
+_SUMMARY_HANDLERS = {
+    '.json': _summary_json,
+    '.html': _summary_html, '.htm': _summary_html,
+    '.css': _summary_css,   '.scss': _summary_css,  '.sass': _summary_css,
+    '.csv': _summary_csv,
+    '.yaml': _summary_yaml, '.yml': _summary_yaml,
+    '.md': _summary_md,
+    '.env': _summary_env,
+}
+
+
+def _parse_file_summary(content: str, filename: str) -> list:
+    """Return a list of human-readable summary strings for non-code files.
+
+    Dispatches on the file suffix through _SUMMARY_HANDLERS.
+    """
+    handler = _SUMMARY_HANDLERS.get(_name_suffix(filename))
+    return handler(content) if handler else []
+
+
+# Markdown summaries show six headings and a '...' marker, so a seventh
+# heading is all the reader has to see
+_MD_SUMMARY_HEADINGS = 7
+_MD_HEADING_LINE_RE = re.compile(r'#{1,3}\s')
+
+
+def _summarize_file(f, name: str) -> list:
+    """_parse_file_summary() for an open text file, reading only what it needs.
+
+    CSV rows are counted while streaming the file instead of holding it,
+    Markdown stops after the heading that shows there are more than the
+    summary lists, and everything else reads at most _SUMMARY_MAX_CHARS.
+    """
+    ext = _name_suffix(name)
+    if ext == '.csv':
+        first_line = f.readline().strip()
+        lines = (1 if first_line else 0) + sum(1 for line in f if not line.isspace())
+        return _csv_summary(first_line, max(0, lines - 1))
+
+    if ext == '.md':
+        chunks = []
+        size = 0
+        candidates = 0
+        check_at = _MD_SUMMARY_HEADINGS
+        for line in f:
+            chunks.append(line)
+            size += len(line)
+            if size >= _SUMMARY_MAX_CHARS:
+                break
+            # Every heading match starts on one of these lines (not every such
+            # line starts a match), so the real count is confirmed with the
+            # summary regex itself, backing off geometrically on misses
+            if _MD_HEADING_LINE_RE.match(line):
+                candidates += 1
+                if candidates >= check_at:
+                    prefix = '\n' + ''.join(chunks)
+                    if len(_MD_HEADING_RE.findall(prefix)) >= _MD_SUMMARY_HEADINGS:
+                        break
+                    check_at *= 2
+        return _parse_file_summary(''.join(chunks)[:_SUMMARY_MAX_CHARS], name)
+
+    return _parse_file_summary(f.read(_SUMMARY_MAX_CHARS), name)
+
+
+def _walk_project(root: str, prefix: str = ''):
+    """Yield (path, rel_path, name) for every file under root, in sorted order.
+
+    Same order and filtering as sorted(Path(root).rglob('*')) followed by the
+    _PROJECT_IGNORE check, but ignored directories are pruned before descent
+    and each entry's type comes from its DirEntry instead of a fresh stat().
+    Like rglob, symlinked directories are not followed.
+    """
+    try:
+        with os.scandir(root) as it:
+            entries = sorted(it, key=lambda e: os.path.normcase(e.name))
+    except OSError:
+        return
+    ignored = _PROJECT_IGNORE
+    for entry in entries:
+        name = entry.name
+        if name in ignored:
+            continue
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _walk_project(entry.path, prefix + name + '/')
+            elif entry.is_file():
+                yield entry.path, prefix + name, name
+        except OSError:
+            continue
+
+
+# parse_project reads files on a thread pool from this many files up
+_PARALLEL_READ_MIN_FILES = 64
+
+
+def _read_project_file(path: str, name: str, category: int):
+    """Load one parse_project() file: the full text of a code file, the
+    _summarize_file() items of anything else, or None if it can't be read.
+    """
+    try:
+        with open(path, encoding='utf-8', errors='replace') as f:
+            if category == _EXT_CODE:
+                return f.read()
+            return _summarize_file(f, name)
+    except Exception:
+        return None
+
+
 def parse_project(repo_path: str) -> dict:
     """Walk all files in repo_path and aggregate structure.
 
@@ -801,6 +1806,8 @@ def parse_project(repo_path: str) -> dict:
       {
         files:         list of {rel_path, classes, functions, imports, error, is_code}
         all_files_list: sorted list of all non-binary relative paths
+        file_groups:   {top-level folder ('.' for the root): [rel_path, ...]},
+                       folders in sorted order, paths in all_files_list order
         all_classes:   list of {name, bases, lineno, methods, file}
         all_functions: list of {name, args, returns, lineno, file}
         total_files:   int  (code files with detected structure)
@@ -816,32 +1823,45 @@ def parse_project(repo_path: str) -> dict:
     all_functions = []
     all_files_list = []
     file_summaries = {}  # rel_path -> list of summary strings for non-code files
-
-    for path in sorted(root.rglob('*')):
-        if not path.is_file():
-            continue
-        if path.suffix.lower() in _BINARY_EXTENSIONS:
-            continue
-        parts = set(path.relative_to(root).parts)
-        if parts & _PROJECT_IGNORE:
+    pending = []  # (rel_path, content, filename) for code files, parsed after the walk
+    groups = defaultdict(list)  # top-level folder -> rel paths, for the blueprint
+
+    classify = _classify_ext  # local binding: called once per file
+    paths, rels, names, categories = [], [], [], []
+    for path, rel, name in _walk_project(str(root)):
+        category = classify(name)
+        if category == _EXT_BINARY:
             continue
-        rel = path.relative_to(root).as_posix()
         all_files_list.append(rel)
-
-        try:
-            content = path.read_text(encoding='utf-8', errors='replace')
-        except Exception:
+        head, sep, _ = rel.partition('/')
+        groups[head if sep else '.'].append(rel)
+        paths.append(path)
+        rels.append(rel)
+        names.append(name)
+        categories.append(category)
+
+    # Reading is open/read/decode syscalls, which release the GIL, so a
+    # cold-cache walk overlaps them on threads; small trees read inline
+    if len(paths) >= _PARALLEL_READ_MIN_FILES:
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as ex:
+            loaded = list(ex.map(_read_project_file, paths, names, categories))
+    else:
+        loaded = map(_read_project_file, paths, names, categories)
+
+    for rel, name, category, data in zip(rels, names, categories, loaded):
+        if data is None:
             continue
-
-        ext = path.suffix.lower()
-        if ext not in _CODE_EXTS:
-            # Data/markup/config file — extract summary info
-            summary = _parse_file_summary(content, path.name)
-            if summary:
-                file_summaries[rel] = summary
+        if category != _EXT_CODE:
+            # Data/markup/config file — summary info
+            if data:
+                file_summaries[rel] = data
             continue
+        pending.append((rel, data, name))
 
-        structure = parse_structure(content, path.name)
+    # Parse every code file in one batch so large projects use all cores
+    structures = parse_structure_many([(content, name) for _, content, name in pending])
+    total_methods = 0
+    for (rel, _, _), structure in zip(pending, structures):
         if not structure['supported']:
             continue
         if not structure['classes'] and not structure['functions']:
@@ -856,16 +1876,20 @@ def parse_project(repo_path: str) -> dict:
         }
         code_files.append(file_entry)
 
+        # parse_structure() hands out fresh dicts, so tag them in place rather
+        # than copying each one; file_entry shares the same objects
         for cls in structure['classes']:
-            all_classes.append({**cls, 'file': rel})
+            cls['file'] = rel
+            all_classes.append(cls)
+            total_methods += len(cls['methods'])
         for fn in structure['functions']:
-            all_functions.append({**fn, 'file': rel})
-
-    total_methods = sum(len(c['methods']) for c in all_classes)
+            fn['file'] = rel
+            all_functions.append(fn)
 
     return {
         'files': code_files,
         'all_files_list': all_files_list,
+        'file_groups': dict(sorted(groups.items())),
         'file_summaries': file_summaries,
         'all_classes': all_classes,
         'all_functions': all_functions,
@@ -877,19 +1901,37 @@ def parse_project(repo_path: str) -> dict:
     }
 
 
+def project_fingerprint(repo_path: str) -> bytes:
+    """Digest of the (rel_path, mtime_ns, size) of every file parse_project() reads.
+
+    Walks the same tree with the same filters but only stats each file, so
+    comparing fingerprints tells a caller whether a cached parse_project()
+    result is still current without reading any file content.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for path, rel, name in _walk_project(str(pathlib.Path(repo_path).resolve())):
+        if _classify_ext(name) == _EXT_BINARY:
+            continue
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        h.update(f"{rel}\0{st.st_mtime_ns}\0{st.st_size}\n".encode('utf-8', errors='surrogatepass'))
+    return h.digest()
+
+
 def _build_inheritance_map(all_classes: list) -> dict:
     """Group classes by their base classes for the inheritance tree section.
 
     Returns {base_name: [child_class_dict, ...]}
     Only includes bases that have at least one child in the project.
     """
-    known_names = {c['name'] for c in all_classes}
     tree: dict = {}
+    setdefault = tree.setdefault
     for cls in all_classes:
         for base in cls['bases']:
             # Use only the short name (last segment) for display
-            short_base = base.split('.')[-1]
-            tree.setdefault(short_base, []).append(cls)
+            setdefault(base.rpartition('.')[2], []).append(cls)
     return tree
 
 
@@ -904,16 +1946,21 @@ def _wrap_names(names: list, prefix: str, max_width: int = 72) -> list:
         return []
     indent = ' ' * len(prefix)
     result_lines = []
-    current = prefix
+    # Tokens of the line being built, joined once per flush
+    buf = [prefix]
+    width = len(prefix)
+    last = len(names) - 1
     for i, name in enumerate(names):
-        separator = ', ' if i < len(names) - 1 else ''
-        token = name + separator
+        token = name + ', ' if i < last else name
         # If adding this token would exceed max_width, flush and start new line
-        if current != prefix and len(current) + len(token) > max_width:
-            result_lines.append(current.rstrip(', '))
-            current = indent + token
+        if len(buf) > 1 and width + len(token) > max_width:
+            result_lines.append(''.join(buf).rstrip(', '))
+            buf = [indent, token]
+            width = len(indent) + len(token)
         else:
-            current += token
+            buf.append(token)
+            width += len(token)
+    current = ''.join(buf)
     if current.strip():
         result_lines.append(current.rstrip(', '))
     return result_lines
@@ -936,70 +1983,75 @@ def format_project_blueprint(project: dict, project_name: str) -> list:
     code_map = {fe['rel_path']: fe for fe in project['files']}
     file_summaries = project.get('file_summaries', {})
 
-    # Group all files by their top-level directory
-    from collections import defaultdict
-    groups: dict = defaultdict(list)
-    for rel in project.get('all_files_list', []):
-        parts = rel.split('/')
-        folder = parts[0] if len(parts) > 1 else '.'
-        groups[folder].append(rel)
-
-    for folder in sorted(groups.keys()):
+    # All files grouped by their top-level directory, already sorted by
+    # parse_project(); rebuilt only for results that predate file_groups
+    groups = project.get('file_groups')
+    if groups is None:
+        groups = defaultdict(list)
+        for rel in project.get('all_files_list', []):
+            head, sep, _ = rel.partition('/')
+            groups[head if sep else '.'].append(rel)
+        groups = dict(sorted(groups.items()))
+
+    append = lines.append  # bound once: called per file, class and method
+    for folder, rels in groups.items():
         folder_label = folder if folder != '.' else project_name
-        lines.append(f"── {folder_label}/ ──")
-        for rel in groups[folder]:
-            filename = rel.split('/')[-1]
-            lines.append(f"  {filename}")
+        append(f"── {folder_label}/ ──")
+        for rel in rels:
+            filename = rel.rpartition('/')[2]
+            append(f"  {filename}")
 
-            if rel in code_map:
+            fe = code_map.get(rel)
+            if fe is not None:
                 # Code file with detected structure
-                fe = code_map[rel]
                 classes = fe['classes']
                 functions = fe['functions']
                 error = fe.get('error')
 
                 if error:
-                    lines.append(f"    ! Parse error: {error}")
+                    append(f"    ! Parse error: {error}")
                     continue
 
                 for cls in classes:
                     bases_str = f" [inherits: {', '.join(cls['bases'])}]" if cls['bases'] else ""
-                    lines.append(f"    CLASS {cls['name']}{bases_str}  [line {cls['lineno']}]")
+                    append(f"    CLASS {cls['name']}{bases_str}  [line {cls['lineno']}]")
                     methods = cls['methods']
-                    if not methods:
-                        lines.append("      └── (no methods)")
-                    elif len(methods) <= 5:
+                    n = len(methods)
+                    if not n:
+                        append("      └── (no methods)")
+                    elif n <= 5:
+                        last = n - 1
                         for i, m in enumerate(methods):
-                            connector = "└──" if i == len(methods) - 1 else "├──"
+                            connector = "└──" if i == last else "├──"
                             prefix = "async " if m['is_async'] else ""
-                            lines.append(f"      {connector} {prefix}{m['name']}({m['args']}){m['returns']}  [line {m['lineno']}]")
+                            append(f"      {connector} {prefix}{m['name']}({m['args']}){m['returns']}  [line {m['lineno']}]")
                     else:
                         for m in methods[:4]:
                             prefix = "async " if m['is_async'] else ""
-                            lines.append(f"      ├── {prefix}{m['name']}({m['args']}){m['returns']}  [line {m['lineno']}]")
-                        lines.append(f"      └── ... and {len(methods) - 4} more method(s)")
+                            append(f"      ├── {prefix}{m['name']}({m['args']}){m['returns']}  [line {m['lineno']}]")
+                        append(f"      └── ... and {n - 4} more method(s)")
 
                 if functions:
                     names = [f['name'] for f in functions]
                     lines.extend(_wrap_names(names, prefix="    Functions: ", max_width=72))
 
-            elif rel in file_summaries:
+            else:
                 # Non-code file with parsed summary
-                for item in file_summaries[rel]:
-                    lines.append(f"    {item}")
+                for item in file_summaries.get(rel, ()):
+                    append(f"    {item}")
 
-        lines.append("")
+        append("")
 
     # Inheritance map
     inh_map = _build_inheritance_map(project['all_classes'])
     if inh_map:
-        lines.append("── INHERITANCE MAP ──")
+        append("── INHERITANCE MAP ──")
         for base, children in sorted(inh_map.items()):
-            lines.append(f"  {base}")
+            append(f"  {base}")
             for i, child in enumerate(children):
                 connector = "└──" if i == len(children) - 1 else "├──"
-                lines.append(f"  {connector} {child['name']}  ({child['file']})")
-        lines.append("")
+                append(f"  {connector} {child['name']}  ({child['file']})")
+        append("")
 
     return lines
 
@@ -1025,30 +2077,37 @@ def format_blueprint(structure: dict, filename: str) -> list:
     lines.append(f"Language: {lang}  •  {n_classes} class(es)  •  {n_methods} method(s)  •  {n_funcs} function(s)")
     lines.append("")
 
-    if structure['imports']:
-        lines.append("IMPORTS")
-        for i, imp in enumerate(structure['imports']):
-            connector = "└──" if i == len(structure['imports']) - 1 else "├──"
-            lines.append(f"  {connector} {imp}")
-        lines.append("")
+    append = lines.append
+    imports = structure['imports']
+    if imports:
+        append("IMPORTS")
+        last = len(imports) - 1
+        for i, imp in enumerate(imports):
+            connector = "└──" if i == last else "├──"
+            append(f"  {connector} {imp}")
+        append("")
 
     for cls in structure['classes']:
         bases_str = f"  (inherits: {', '.join(cls['bases'])})" if cls['bases'] else "  (no base class)"
-        lines.append(f"CLASS {cls['name']}{bases_str}  [line {cls['lineno']}]")
-        for i, m in enumerate(cls['methods']):
-            connector = "└──" if i == len(cls['methods']) - 1 else "├──"
+        append(f"CLASS {cls['name']}{bases_str}  [line {cls['lineno']}]")
+        methods = cls['methods']
+        last = len(methods) - 1
+        for i, m in enumerate(methods):
+            connector = "└──" if i == last else "├──"
             prefix = "async " if m['is_async'] else ""
-            lines.append(f"  {connector} {prefix}{m['name']}({m['args']}){m['returns']}  [line {m['lineno']}]")
-        if not cls['methods']:
-            lines.append("  └── (no methods)")
-        lines.append("")
-
-    if structure['functions']:
-        lines.append("MODULE-LEVEL FUNCTIONS")
-        for i, fn in enumerate(structure['functions']):
-            connector = "└──" if i == len(structure['functions']) - 1 else "├──"
+            append(f"  {connector} {prefix}{m['name']}({m['args']}){m['returns']}  [line {m['lineno']}]")
+        if not methods:
+            append("  └── (no methods)")
+        append("")
+
+    functions = structure['functions']
+    if functions:
+        append("MODULE-LEVEL FUNCTIONS")
+        last = len(functions) - 1
+        for i, fn in enumerate(functions):
+            connector = "└──" if i == last else "├──"
             prefix = "async " if fn['is_async'] else ""
-            lines.append(f"  {connector} {prefix}{fn['name']}({fn['args']}){fn['returns']}  [line {fn['lineno']}]")
+            append(f"  {connector} {prefix}{fn['name']}({fn['args']}){fn['returns']}  [line {fn['lineno']}]")
 
     return lines
 
@@ -1056,11 +2115,12 @@ def format_blueprint(structure: dict, filename: str) -> list:
 def get_file_info(file_path):
     """Get processed metadata about a file"""
     path = pathlib.Path(file_path)
-    
-    if not path.exists():
+
+    # One stat() call; exists() followed by stat() would make two
+    try:
+        stat = path.stat()
+    except OSError:
         return None
-    
-    stat = path.stat()
     return {
         'name': path.name,
         'path': str(path),
@@ -1,26 +1,79 @@
+import codecs
+import io
+import itertools
+import os
+import queue
 import re
 from textual.app import App, ComposeResult
 from textual.widgets import Footer, DirectoryTree, TextArea, Static
 from textual.containers import Horizontal, Vertical
+from textual.message import Message
 from textual import work
 from pathlib import Path
-from typing import Iterable
-from codesensei.scanner import get_file_info
+from typing import Callable, Iterable
+from codesensei.copilot import (
+    devil_analyze, summarize_file, review_file, review_diff, resolve_conflicts,
+)
+from codesensei.scanner import (
+    get_file_info, get_staged_diff_for_file, has_merge_conflicts,
+    parse_project, format_project_blueprint, project_fingerprint,
+    parse_structure, format_blueprint,
+)
 
-BINARY_EXTENSIONS = {
+BINARY_EXTENSIONS = frozenset({
     '.png', '.jpg', '.jpeg', '.gif', '.bmp', '.ico', '.svg',
     '.pdf', '.zip', '.tar', '.gz', '.rar', '.7z',
     '.exe', '.dll', '.so', '.dylib', '.bin',
     '.mp3', '.mp4', '.wav', '.avi', '.mov',
     '.pyc', '.pyd', '.whl',
-}
+})
 
-_STRIP_MARKUP = re.compile(r'\[/?[^\]]*\]')
+# A tag never spans lines, so one sub() over the joined results text strips
+# exactly what per-line subs would
+_STRIP_MARKUP = re.compile(r'\[/?[^\]\n]*\]')
 
 
 def _plain(text: str) -> str:
     """Strip Rich markup tags from a string."""
-    return _STRIP_MARKUP.sub('', text)
+    # Most results carry no markup at all; skip the regex pass for those
+    return _STRIP_MARKUP.sub('', text) if '[' in text else text
+
+
+def _has_content(text: str) -> bool:
+    """True if text has any non-whitespace character, without copying it as strip() would."""
+    return bool(text) and not text.isspace()
+
+
+# Files at least this large are decoded chunk by chunk, so the whole raw byte
+# string never sits in memory next to its decoded copy
+_STREAM_READ_MIN = 1_000_000
+_STREAM_READ_CHUNK = io.DEFAULT_BUFFER_SIZE * 16
+# A NUL byte this early means binary content, whatever the extension says
+_BINARY_SNIFF_BYTES = 8192
+
+
+def _read_source(path: Path, size: int | None = None) -> str | None:
+    """Same text as path.read_text(encoding='utf-8', errors='replace'), read
+    unbuffered instead of through a TextIOWrapper: one read and decode for
+    ordinary files, an incremental decode past _STREAM_READ_MIN bytes.
+    Returns None without reading further if the first _BINARY_SNIFF_BYTES
+    contain a NUL byte. `size` is the file size if the caller already
+    stat()ed it; otherwise the open file is fstat()ed."""
+    with open(path, 'rb', buffering=0) as f:
+        head = f.read(_BINARY_SNIFF_BYTES)
+        if b'\x00' in head:
+            return None
+        if size is None:
+            size = os.fstat(f.fileno()).st_size
+        if size < _STREAM_READ_MIN:
+            content = (head + f.read()).decode('utf-8', 'replace')
+        else:
+            chunks = itertools.chain((head,), iter(lambda: f.read(_STREAM_READ_CHUNK), b''))
+            content = ''.join(codecs.iterdecode(chunks, 'utf-8', 'replace'))
+    if '\r' in content:
+        # read_text() applies universal-newline translation; match it
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content
 
 
 BANNER = (
@@ -34,13 +87,123 @@ BANNER = (
 )
 
 
+_MODE_HEADERS = {
+    "devil":      "🔥 CodeSensei — Devil Mode",
+    "learn":      "🎓 CodeSensei — Learning Mode",
+    "review":     "🔍 CodeSensei — Review Mode",
+    "conflict":   "⚡ CodeSensei — Conflict Resolution",
+    "git_review": "⚙ CodeSensei — Git Review",
+    "blueprint":  "📐 CodeSensei — Blueprint Mode",
+}
+
+# Start banner and background worker for the single-file analysis modes
+_ANALYSIS_MODES = {
+    "devil":  ("🔥 Devil Mode — scanning", "_run_devil"),
+    "learn":  ("🎓 Learn Mode — explaining", "_run_learn"),
+    "review": ("🔍 Review Mode — reviewing", "_run_review"),
+}
+
+_MODE_TIPS = {
+    "devil":      "💡 Press R for a full code review",
+    "learn":      "💡 Press D for security analysis",
+    "review":     "💡 Press D for a hostile security scan",
+    "conflict":   "💡 Press D for security analysis of resolved code",
+    "git_review": "💡 Press D for a full security scan of the file",
+    "blueprint":  "💡 Press D to run a security scan on this structure",
+}
+
+# Classifies a Copilot error message in one match. Each alternative is a
+# lookahead over the whole message, tried in order at position 0, so the
+# first kind listed wins wherever its keyword appears (quota before auth
+# before missing CLI before timeout); m.lastgroup names the kind.
+_ERROR_KIND_RE = re.compile(
+    r'(?=.*?(?:402|quota))(?P<quota>)'
+    r'|(?=.*?(?:401|unauthorized|unauthenticated))(?P<auth>)'
+    r'|(?=.*?(?:not found|filenotfound|no such file))(?P<missing>)'
+    r'|(?=.*?(?:timed out|timeout))(?P<timeout>)',
+    re.IGNORECASE | re.DOTALL,
+)
+
+# Fix-it text per error kind ('timeout' echoes the message, so it is built inline)
+_ERROR_HINTS = {
+    "quota": (
+        "⛔ GitHub Copilot quota exceeded (402)",
+        "",
+        "Your Copilot usage limit has been reached.",
+        "Fix:",
+        "  1. Go to: github.com → Settings → Copilot",
+        "  2. Check your plan / subscribe ($10/month)",
+        "  3. Students: education.github.com (free)",
+        "  Run: gh auth status   to check your account",
+    ),
+    "auth": (
+        "⛔ Not authenticated with GitHub Copilot",
+        "Fix: gh auth login",
+    ),
+    "missing": (
+        "⛔ GitHub Copilot CLI not found",
+        "Fix: gh extension install github/gh-copilot",
+    ),
+}
+
+
+# Static results-panel screens, joined once. They contain no markup, so they
+# are loaded directly rather than through _set_results()
+_BOOT_TEXT = '\n'.join((
+    "> CodeSensei v1.0 initialized...",
+    "> System online. AI engine ready.",
+    "> Awaiting target... select a file to begin.",
+    "",
+    "  D = Devil Mode    L = Learn Mode    R = Review Mode",
+    "  C = Conflict Resolution    G = Git Review",
+    "  B = Blueprint Mode",
+))
+
+_READY_TEXT = '\n'.join((
+    "> CodeSensei ready. Select a file to begin.",
+    "",
+    "  D = Devil Mode    L = Learn Mode    R = Review Mode",
+    "  C = Conflict Resolution    G = Git Review",
+    "  B = Blueprint Mode",
+))
+
+_HELP_TEXT = '\n'.join((
+    "━━━━━━ CodeSensei Help ━━━━━━",
+    "",
+    "Keyboard Shortcuts:",
+    "  D  Devil Mode   — hostile security scan",
+    "  L  Learn Mode   — educational explanation",
+    "  R  Review Mode  — senior developer code review",
+    "  C  Conflicts    — resolve git merge conflicts",
+    "  G  Git Review   — review staged git diff (pre-commit)",
+    "  B  Blueprint    — class structure diagram + architectural analysis",
+    "  F5 Refresh      — re-run the last Learn/Review, ignoring cached results",
+    "  ?  Help         — show this screen",
+    "  Q  Quit         — exit CodeSensei",
+    "  Esc             — cancel / go back",
+    "",
+    "Navigation:",
+    "  Arrow keys — navigate file tree",
+    "  Enter      — select file",
+    "",
+    "Results panel:",
+    "  Click and drag to select text",
+    "  Ctrl+A to select all, Ctrl+C to copy",
+    "",
+    "About:",
+    "  CodeSensei — AI-Powered Code Analysis",
+    "  Built for the GitHub Copilot CLI Challenge",
+))
+
+
 class FilteredDirectoryTree(DirectoryTree):
 
-    IGNORE = {'.venv', 'venv', '__pycache__', '.git', 'node_modules',
-              'env', '.env', 'dist', 'build', '.pytest_cache'}
+    IGNORE = frozenset({'.venv', 'venv', '__pycache__', '.git', 'node_modules',
+                        'env', '.env', 'dist', 'build', '.pytest_cache'})
 
     def filter_paths(self, paths: Iterable[Path]) -> Iterable[Path]:
-        return [path for path in paths if path.name not in self.IGNORE]
+        ignore = self.IGNORE
+        return [path for path in paths if path.name not in ignore]
 
 
 class CodeSenseiApp(App):
@@ -55,6 +218,7 @@ class CodeSenseiApp(App):
         ("c", "resolve_conflicts", "Conflicts"),
         ("g", "git_review", "Git Review"),
         ("b", "blueprint", "Blueprint"),
+        ("f5", "refresh", "Refresh"),
         ("escape", "back", "Back"),
         ("question_mark", "help_screen", "Help"),
         ("q", "quit", "Quit"),
@@ -112,6 +276,18 @@ class CodeSenseiApp(App):
         self.repo_path = Path(repo_path).resolve()
         self.current_file_path: Path | None = None
         self.current_file_content: str = ""
+        self.current_line_count: int = 0  # len(current_file_content.splitlines())
+        self.current_file_info: dict | None = None  # get_file_info(current_file_path)
+        self.current_large_warning: str | None = None  # set when past the 800-line cut
+        self._project_cache: tuple[bytes, dict] | None = None  # (project_fingerprint, parse_project)
+        self._last_analysis: str | None = None  # last _ANALYSIS_MODES key started, for F5
+        # Last text loaded into each TextArea; both are read-only, so
+        # load_text() is the only thing that changes them
+        self._results_text: str = ""
+        self._viewer_text: str = ""
+        # Worker results as (callback, args), applied on the UI thread when
+        # a ResultsPosted message arrives; only the newest of a burst is shown
+        self._result_queue: queue.SimpleQueue[tuple[Callable[..., None], tuple]] = queue.SimpleQueue()
 
     def compose(self) -> ComposeResult:
         yield Static(BANNER, id="banner")
@@ -122,50 +298,66 @@ class CodeSenseiApp(App):
                 yield TextArea("", id="results", read_only=True)
         yield Footer()
 
+    def _load_results(self, text: str) -> None:
+        """load_text() into the results panel unless it already shows `text`."""
+        if text != self._results_text:
+            self._results_text = text
+            self._results.load_text(text)
+
+    def _load_viewer(self, text: str) -> None:
+        """load_text() into the code viewer unless it already shows `text`."""
+        if text != self._viewer_text:
+            self._viewer_text = text
+            self._viewer.load_text(text)
+
     def _set_results(self, *lines: str) -> None:
         """Write plain text to the results panel (strips any Rich markup)."""
-        text = '\n'.join(_plain(line) for line in lines)
-        self.query_one("#results", TextArea).load_text(text)
+        self._load_results(_plain('\n'.join(lines)))
 
     def on_mount(self) -> None:
-        self._set_results(
-            "> CodeSensei v1.0 initialized...",
-            "> System online. AI engine ready.",
-            "> Awaiting target... select a file to begin.",
-            "",
-            "  D = Devil Mode    L = Learn Mode    R = Review Mode",
-            "  C = Conflict Resolution    G = Git Review",
-            "  B = Blueprint Mode",
-        )
+        # Looked up once; every results/viewer update reuses these
+        self._results = self.query_one("#results", TextArea)
+        self._viewer = self.query_one("#code-viewer", TextArea)
+        self._load_results(_BOOT_TEXT)
 
     def on_directory_tree_file_selected(self, event: DirectoryTree.FileSelected) -> None:
         fp = event.path
         self.current_file_path = fp
-        viewer = self.query_one("#code-viewer", TextArea)
-
-        # Binary file check
-        if fp.suffix.lower() in BINARY_EXTENSIONS:
+        # The one stat() per selection; the read and Esc reuse it
+        self.current_file_info = info = get_file_info(fp)
+
+        # Binary file check: by extension, else by sniffing the content
+        content = None
+        if fp.suffix.lower() not in BINARY_EXTENSIONS:
+            try:
+                content = _read_source(fp, info['size_raw'] if info else None)
+            except Exception as e:
+                self._set_results(f"Error reading file: {e}")
+                return
+        if content is None:
             self.current_file_content = ""
-            viewer.load_text(f"[Binary file: {fp.name}]")
+            self.current_line_count = 0
+            self.current_large_warning = None
+            self._load_viewer(f"[Binary file: {fp.name}]")
             self._set_results(f"{fp.name}  (binary — cannot analyze)")
             return
 
-        # Read file content
-        try:
-            content = fp.read_text(encoding='utf-8', errors='replace')
-        except Exception as e:
-            self._set_results(f"Error reading file: {e}")
-            return
-
         self.current_file_content = content
-        viewer.load_text(content)
+        # Counted once here; every action and Esc reuses it
+        self.current_line_count = line_count = len(content.splitlines())
+        self.current_large_warning = (
+            f"⚠ Large file ({line_count} lines) — applying smart truncation..."
+            if line_count > 800 else None
+        )
+        self._load_viewer(content)
+        self._show_file_info()
 
-        info = get_file_info(fp)
+    def _show_file_info(self) -> None:
+        info = self.current_file_info
         if info:
-            line_count = len(content.splitlines())
             self._set_results(
                 f"File:  {info['name']}",
-                f"Size:  {info['size_display']}  •  {line_count} lines",
+                f"Size:  {info['size_display']}  •  {self.current_line_count} lines",
                 f"Path:  {info['path']}",
                 "",
                 "Press D = Devil Mode  L = Learn Mode  R = Review Mode",
@@ -175,60 +367,48 @@ class CodeSenseiApp(App):
 
     # ── Mode Actions ──────────────────────────────────────────────────────────
 
-    def action_devil(self) -> None:
+    def _start_analysis(self, mode: str, refresh: bool = False) -> None:
         if not self.current_file_path:
             self._set_results("Select a file first using the file tree.")
             return
-        if not self.current_file_content.strip():
+        if not _has_content(self.current_file_content):
             self._set_results("File is empty — nothing to analyze.")
             return
 
-        line_count = len(self.current_file_content.splitlines())
-        lines = [f"🔥 Devil Mode — scanning {self.current_file_path.name}"]
-        if line_count > 800:
-            lines.append(f"⚠ Large file ({line_count} lines) — applying smart truncation...")
+        banner, worker = _ANALYSIS_MODES[mode]
+        lines = [f"{banner} {self.current_file_path.name}"]
+        if self.current_large_warning:
+            lines.append(self.current_large_warning)
         lines.append("Analyzing...")
         self._set_results(*lines)
-        self._run_devil()
+        self._last_analysis = mode
+        run = getattr(self, worker)
+        if refresh:
+            run(refresh=True)
+        else:
+            run()
 
-    def action_learn(self) -> None:
-        if not self.current_file_path:
-            self._set_results("Select a file first using the file tree.")
-            return
-        if not self.current_file_content.strip():
-            self._set_results("File is empty — nothing to analyze.")
-            return
+    def action_devil(self) -> None:
+        self._start_analysis("devil")
 
-        line_count = len(self.current_file_content.splitlines())
-        lines = [f"🎓 Learn Mode — explaining {self.current_file_path.name}"]
-        if line_count > 800:
-            lines.append(f"⚠ Large file ({line_count} lines) — applying smart truncation...")
-        lines.append("Analyzing...")
-        self._set_results(*lines)
-        self._run_learn()
+    def action_learn(self) -> None:
+        self._start_analysis("learn")
 
     def action_review(self) -> None:
-        if not self.current_file_path:
-            self._set_results("Select a file first using the file tree.")
-            return
-        if not self.current_file_content.strip():
-            self._set_results("File is empty — nothing to analyze.")
-            return
+        self._start_analysis("review")
 
-        line_count = len(self.current_file_content.splitlines())
-        lines = [f"🔍 Review Mode — reviewing {self.current_file_path.name}"]
-        if line_count > 800:
-            lines.append(f"⚠ Large file ({line_count} lines) — applying smart truncation...")
-        lines.append("Analyzing...")
-        self._set_results(*lines)
-        self._run_review()
+    def action_refresh(self) -> None:
+        # Only Learn and Review answers are cached (see copilot.call_copilot_cached)
+        if self._last_analysis in ("learn", "review"):
+            self._start_analysis(self._last_analysis, refresh=True)
+        else:
+            self._set_results("Nothing to refresh — press L or R first.")
 
     def action_git_review(self) -> None:
         if not self.current_file_path:
             self._set_results("Select a file first using the file tree.")
             return
 
-        from codesensei.scanner import get_staged_diff_for_file
         diff_data = get_staged_diff_for_file(str(self.repo_path), str(self.current_file_path))
 
         if not diff_data['is_git_repo']:
@@ -256,11 +436,10 @@ class CodeSenseiApp(App):
         if not self.current_file_path:
             self._set_results("Select a file first using the file tree.")
             return
-        if not self.current_file_content.strip():
+        if not _has_content(self.current_file_content):
             self._set_results("File is empty — nothing to analyze.")
             return
 
-        from codesensei.scanner import has_merge_conflicts
         if not has_merge_conflicts(self.current_file_content):
             self._set_results(
                 "No merge conflicts found in this file.",
@@ -275,13 +454,8 @@ class CodeSenseiApp(App):
         self._run_resolve_conflicts()
 
     def action_blueprint(self) -> None:
-        from codesensei.scanner import (
-            parse_project, format_project_blueprint,
-            parse_structure, format_blueprint,
-        )
-
         # ── FILE-LEVEL: a file is open in the viewer ──────────────────────────
-        if self.current_file_path and self.current_file_content.strip():
+        if self.current_file_path and _has_content(self.current_file_content):
             filename = self.current_file_path.name
             structure = parse_structure(self.current_file_content, filename)
             skeleton_lines = format_blueprint(structure, filename)
@@ -303,7 +477,13 @@ class CodeSenseiApp(App):
             f"📐 Blueprint — {project_name} (whole project)",
             "Building class diagram...",
         )
-        project = parse_project(str(self.repo_path))
+        # Reuse the last scan while no file has been added, removed or modified
+        fingerprint = project_fingerprint(str(self.repo_path))
+        if self._project_cache and self._project_cache[0] == fingerprint:
+            project = self._project_cache[1]
+        else:
+            project = parse_project(str(self.repo_path))
+            self._project_cache = (fingerprint, project)
 
         if project['total_files'] == 0:
             self._set_results(
@@ -328,134 +508,92 @@ class CodeSenseiApp(App):
 
     def action_back(self) -> None:
         self.workers.cancel_all()
-        viewer = self.query_one("#code-viewer", TextArea)
 
         if self.current_file_path and self.current_file_content:
-            viewer.load_text(self.current_file_content)
-            info = get_file_info(self.current_file_path)
-            if info:
-                line_count = len(self.current_file_content.splitlines())
-                self._set_results(
-                    f"File:  {info['name']}",
-                    f"Size:  {info['size_display']}  •  {line_count} lines",
-                    f"Path:  {info['path']}",
-                    "",
-                    "Press D = Devil Mode  L = Learn Mode  R = Review Mode",
-                    "      C = Conflict Resolution  G = Git Review",
-                    "      B = Blueprint",
-                )
+            self._load_viewer(self.current_file_content)
+            self._show_file_info()
         else:
-            viewer.load_text("")
-            self._set_results(
-                "> CodeSensei ready. Select a file to begin.",
-                "",
-                "  D = Devil Mode    L = Learn Mode    R = Review Mode",
-                "  C = Conflict Resolution    G = Git Review",
-                "  B = Blueprint Mode",
-            )
+            self._load_viewer("")
+            self._load_results(_READY_TEXT)
 
     def action_help_screen(self) -> None:
-        self._set_results(
-            "━━━━━━ CodeSensei Help ━━━━━━",
-            "",
-            "Keyboard Shortcuts:",
-            "  D  Devil Mode   — hostile security scan",
-            "  L  Learn Mode   — educational explanation",
-            "  R  Review Mode  — senior developer code review",
-            "  C  Conflicts    — resolve git merge conflicts",
-            "  G  Git Review   — review staged git diff (pre-commit)",
-            "  B  Blueprint    — class structure diagram + architectural analysis",
-            "  ?  Help         — show this screen",
-            "  Q  Quit         — exit CodeSensei",
-            "  Esc             — cancel / go back",
-            "",
-            "Navigation:",
-            "  Arrow keys — navigate file tree",
-            "  Enter      — select file",
-            "",
-            "Results panel:",
-            "  Click and drag to select text",
-            "  Ctrl+A to select all, Ctrl+C to copy",
-            "",
-            "About:",
-            "  CodeSensei — AI-Powered Code Analysis",
-            "  Built for the GitHub Copilot CLI Challenge",
-        )
+        self._load_results(_HELP_TEXT)
 
     # ── Background Workers ────────────────────────────────────────────────────
 
+    class ResultsPosted(Message):
+        """Wakes the UI thread to apply queued worker results."""
+
+    def _post_result(self, callback: Callable[..., None], *args) -> None:
+        """Hand a worker's result to the UI thread without blocking on it.
+
+        post_message() is thread-safe and, unlike call_from_thread(), does
+        not wait for the UI thread to run the callback.
+        """
+        self._result_queue.put((callback, args))
+        self.post_message(self.ResultsPosted())
+
+    def on_code_sensei_app_results_posted(self, message: ResultsPosted) -> None:
+        # Later messages of a burst find the queue already drained
+        latest = None
+        while True:
+            try:
+                latest = self._result_queue.get_nowait()
+            except queue.Empty:
+                break
+        if latest is not None:
+            callback, args = latest
+            callback(*args)
+
     @work(thread=True, exclusive=True)
     def _run_devil(self) -> None:
-        from codesensei.copilot import devil_analyze
         fp = self.current_file_path
         if fp is None:
             return
         result = devil_analyze(self.current_file_content, fp.name)
-        self.call_from_thread(self._show_result, result, "devil")
+        self._post_result(self._show_result, result, "devil")
 
     @work(thread=True, exclusive=True)
-    def _run_learn(self) -> None:
-        from codesensei.copilot import summarize_file
+    def _run_learn(self, refresh: bool = False) -> None:
         fp = self.current_file_path
         if fp is None:
             return
-        result = summarize_file(self.current_file_content, fp.name)
-        self.call_from_thread(self._show_result, result, "learn")
+        result = summarize_file(self.current_file_content, fp.name, refresh=refresh)
+        self._post_result(self._show_result, result, "learn")
 
     @work(thread=True, exclusive=True)
-    def _run_review(self) -> None:
-        from codesensei.copilot import review_file
+    def _run_review(self, refresh: bool = False) -> None:
         fp = self.current_file_path
         if fp is None:
             return
-        result = review_file(self.current_file_content, fp.name)
-        self.call_from_thread(self._show_result, result, "review")
+        result = review_file(self.current_file_content, fp.name, refresh=refresh)
+        self._post_result(self._show_result, result, "review")
 
     @work(thread=True, exclusive=True)
     def _run_git_review(self) -> None:
-        from codesensei.copilot import review_diff
-        from codesensei.scanner import get_staged_diff_for_file
         fp = self.current_file_path
         if fp is None:
             return
         diff_data = get_staged_diff_for_file(str(self.repo_path), str(fp))
         if not diff_data['has_changes']:
-            self.call_from_thread(self._set_results, f"⚠ {fp.name} is not staged.")
+            self._post_result(self._set_results, f"⚠ {fp.name} is not staged.")
             return
         result = review_diff(diff_data['diff'])
         result['reviewed_file'] = fp.name
-        self.call_from_thread(self._show_result, result, "git_review")
+        self._post_result(self._show_result, result, "git_review")
 
     @work(thread=True, exclusive=True)
     def _run_resolve_conflicts(self) -> None:
-        from codesensei.copilot import resolve_conflicts
         fp = self.current_file_path
         if fp is None:
             return
         result = resolve_conflicts(self.current_file_content, fp.name)
-        self.call_from_thread(self._show_result, result, "conflict")
+        self._post_result(self._show_result, result, "conflict")
 
     # ── Display Helpers ───────────────────────────────────────────────────────
 
     def _show_result(self, result: dict, mode: str) -> None:
-        mode_headers = {
-            "devil":      "🔥 CodeSensei — Devil Mode",
-            "learn":      "🎓 CodeSensei — Learning Mode",
-            "review":     "🔍 CodeSensei — Review Mode",
-            "conflict":   "⚡ CodeSensei — Conflict Resolution",
-            "git_review": "⚙ CodeSensei — Git Review",
-            "blueprint":  "📐 CodeSensei — Blueprint Mode",
-        }
-        mode_tips = {
-            "devil":      "💡 Press R for a full code review",
-            "learn":      "💡 Press D for security analysis",
-            "review":     "💡 Press D for a hostile security scan",
-            "conflict":   "💡 Press D for security analysis of resolved code",
-            "git_review": "💡 Press D for a full security scan of the file",
-            "blueprint":  "💡 Press D to run a security scan on this structure",
-        }
-
-        lines = [mode_headers.get(mode, "CodeSensei")]
+        lines = [_MODE_HEADERS.get(mode, "CodeSensei")]
 
         if mode == "git_review" and result.get('reviewed_file'):
             lines.append(f"Staged diff of: {result['reviewed_file']}")
@@ -482,46 +620,31 @@ class CodeSenseiApp(App):
                 if len(cmd_display) > 80:
                     cmd_display = cmd_display[:77] + "..."
                 lines.append(f"Command: {cmd_display}")
-            lines.append(f"⏱ Response: {elapsed:.1f}s")
-            lines.append("─────────────────────────────────")
-            lines.append(result['response'])
-            lines.append("─────────────────────────────────")
+            lines += (
+                "⏱ Cached result — press F5 to re-run" if result.get('cached')
+                else f"⏱ Response: {elapsed:.1f}s",
+                "─────────────────────────────────",
+                result['response'],
+                "─────────────────────────────────",
+            )
             if result.get('stats'):
                 lines.append(result['stats'])
         else:
             error = result.get('error', 'Unknown error')
-            err_lower = error.lower()
-            if '402' in error or 'quota' in err_lower or 'no quota' in err_lower:
-                lines += [
-                    "⛔ GitHub Copilot quota exceeded (402)",
-                    "",
-                    "Your Copilot usage limit has been reached.",
-                    "Fix:",
-                    "  1. Go to: github.com → Settings → Copilot",
-                    "  2. Check your plan / subscribe ($10/month)",
-                    "  3. Students: education.github.com (free)",
-                    "  Run: gh auth status   to check your account",
-                ]
-            elif '401' in error or 'unauthorized' in err_lower or 'unauthenticated' in err_lower:
-                lines += [
-                    "⛔ Not authenticated with GitHub Copilot",
-                    "Fix: gh auth login",
-                ]
-            elif 'not found' in err_lower or 'filenotfound' in err_lower or 'no such file' in err_lower:
-                lines += [
-                    "⛔ GitHub Copilot CLI not found",
-                    "Fix: gh extension install github/gh-copilot",
-                ]
-            elif 'timed out' in err_lower or 'timeout' in err_lower:
+            kind = _ERROR_KIND_RE.match(error)
+            kind = kind.lastgroup if kind else None
+            if kind == 'timeout':
                 lines += [
                     f"⏱ {error}",
                     "Try selecting a smaller file or run again.",
                 ]
+            elif kind:
+                lines += _ERROR_HINTS[kind]
             else:
                 lines.append(f"Error: {error}")
 
-        lines += ["", mode_tips.get(mode, ""), "", "Powered by GitHub Copilot"]
-        self.query_one("#results", TextArea).load_text('\n'.join(lines))
+        lines += ["", _MODE_TIPS.get(mode, ""), "", "Powered by GitHub Copilot"]
+        self._load_results('\n'.join(lines))
 
 
 def run_app(path: str = "."):